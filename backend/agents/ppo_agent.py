@@ -1,6 +1,16 @@
+import os
+
+import numpy as np
+import torch
 from stable_baselines3 import PPO
 from stable_baselines3.common.callbacks import BaseCallback
-from backend.env.rl_env import RLMarketEnv
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
+from backend.env.rl_env import RLMarketEnv, RLMultiAssetEnv
+from backend.env.vec_env import RLMarketVecEnv
+
+
+# Training is seeded so identical settings reproduce the same policy.
+PPO_SEED = 42
 
 
 class ProgressCallback(BaseCallback):
@@ -33,6 +43,27 @@ class ProgressCallback(BaseCallback):
         return True
 
 
+def build_env(prices, env_kwargs):
+    """
+    A 2-D price matrix selects the multi-asset env, which has its own
+    fixed reward shaping and only takes trade_size.
+    """
+    if np.ndim(prices) == 2:
+        return RLMultiAssetEnv(prices, trade_size=env_kwargs["trade_size"])
+    return RLMarketEnv(prices, **env_kwargs)
+
+
+def make_env_fn(prices, env_kwargs):
+    """
+    Build a picklable env factory for subprocess workers.
+    """
+
+    def _init():
+        return build_env(prices, env_kwargs)
+
+    return _init
+
+
 def train_ppo(
     prices,
     timesteps=10_000,
@@ -48,9 +79,11 @@ def train_ppo(
     log_every=5000,
     progress_label="PPO",
     progress_hook=None,
+    n_envs=1,
+    n_workers=0,
+    torch_threads=None,
 ):
-    env = RLMarketEnv(
-        prices,
+    env_kwargs = dict(
         reward_mode=reward_mode,
         drawdown_coeff=drawdown_coeff,
         volatility_coeff=volatility_coeff,
@@ -59,23 +92,61 @@ def train_ppo(
         inactivity_penalty=inactivity_penalty,
         trade_size=trade_size,
     )
+    n_envs = max(1, int(n_envs))
+    n_workers = max(0, int(n_workers))
+    if n_workers > 1:
+        # Each env copy runs in its own worker process; n_workers caps
+        # how many start.
+        if n_envs > n_workers:
+            raise ValueError(
+                f"n_envs ({n_envs}) exceeds n_workers ({n_workers}); each "
+                "worker process hosts one env, so use n_envs <= n_workers "
+                "or n_workers=0 for in-process envs."
+            )
+        if torch_threads is None:
+            # Leave the env workers their cores; torch would otherwise
+            # start one learner thread per core on top of them.
+            torch_threads = max(1, (os.cpu_count() or 1) - n_envs)
+        env = SubprocVecEnv(
+            [make_env_fn(prices, env_kwargs) for _ in range(n_envs)]
+        )
+    elif n_envs > 1 and np.ndim(prices) == 2:
+        env = DummyVecEnv(
+            [lambda: build_env(prices, env_kwargs) for _ in range(n_envs)]
+        )
+    elif n_envs > 1:
+        env = RLMarketVecEnv(prices, n_envs=n_envs, **env_kwargs)
+    else:
+        env = build_env(prices, env_kwargs)
 
-    model = PPO(
-        policy="MlpPolicy",
-        env=env,
-        verbose=0,
-        seed=42,
-        ent_coef=entropy_coef,
-    )
-
-    callback = None
-    if progress:
-        callback = ProgressCallback(
-            timesteps,
-            log_every=log_every,
-            label=progress_label,
-            on_progress=progress_hook,
+    # The thread count is process-wide, so restore it after training.
+    default_threads = torch.get_num_threads()
+    if torch_threads:
+        torch.set_num_threads(int(torch_threads))
+    try:
+        # Keep the rollout size per update close to the single-env default.
+        model = PPO(
+            policy="MlpPolicy",
+            env=env,
+            verbose=0,
+            seed=PPO_SEED,
+            ent_coef=entropy_coef,
+            n_steps=max(64, 2048 // n_envs),
         )
 
-    model.learn(total_timesteps=timesteps, callback=callback)
+        callback = None
+        if progress:
+            callback = ProgressCallback(
+                timesteps,
+                log_every=log_every,
+                label=progress_label,
+                on_progress=progress_hook,
+            )
+
+        model.learn(total_timesteps=timesteps, callback=callback)
+    finally:
+        # Shut the worker processes down even if training fails.
+        if n_workers > 1:
+            env.close()
+        torch.set_num_threads(default_threads)
     return model
@@ -4,12 +4,13 @@ import random
 class RandomAgent:
     """
     Baseline agent that selects actions uniformly at random.
+    Each agent owns its RNG stream, so episodes stay reproducible
+    when run in parallel.
     """
 
     def __init__(self, action_space=(0, 1, 2), seed=None):
         self.action_space = action_space
-        if seed is not None:
-            random.seed(seed)
+        self.rng = random.Random(seed)
 
     def act(self, state):
-        return random.choice(self.action_space)
+        return self.rng.choice(self.action_space)
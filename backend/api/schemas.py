@@ -16,6 +16,11 @@ class ExperimentRequest(BaseModel):
     invalid_action_penalty: float = 0.0
     inactivity_penalty: float = 0.0
     trade_size: int = 1
+    n_envs: int = 1
+    n_workers: int = 0
+    torch_threads: Optional[int] = None
+    assets: Optional[List[str]] = None
+    rolling_window: Optional[int] = None
 
 
 class ExperimentResponse(BaseModel):
@@ -2,10 +2,12 @@ from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 import json
+import os
 import queue
 import threading
 
 from experiments.experiment_config import ExperimentConfig
+from backend.simulations.result_cache import cache_from_env
 from backend.simulations.run_simulation import run_configured_experiment
 from backend.api.schemas import ExperimentRequest, ExperimentResponse
 
@@ -23,6 +25,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Repeated requests are served from disk when PROSPERITY_RESULT_CACHE is set.
+result_cache = cache_from_env()
+
+
+def request_config(request: ExperimentRequest):
+    # Callers cannot start more worker processes or threads than cores.
+    cores = os.cpu_count() or 1
+    torch_threads = request.torch_threads
+    if torch_threads is not None:
+        torch_threads = min(torch_threads, cores)
+    return ExperimentConfig(
+        scenario=request.scenario,
+        agent_type=request.agent_type,
+        episodes=request.episodes,
+        timesteps=request.timesteps,
+        reward_mode=request.reward_mode,
+        schedule=request.schedule,
+        schedule_length=request.schedule_length,
+        drawdown_coeff=request.drawdown_coeff,
+        volatility_coeff=request.volatility_coeff,
+        trade_penalty_coeff=request.trade_penalty_coeff,
+        invalid_action_penalty=request.invalid_action_penalty,
+        inactivity_penalty=request.inactivity_penalty,
+        trade_size=request.trade_size,
+        n_envs=request.n_envs,
+        n_workers=min(request.n_workers, cores),
+        torch_threads=torch_threads,
+        assets=request.assets,
+        rolling_window=request.rolling_window,
+    )
+
 
 @app.get("/")
 def root():
@@ -32,23 +65,9 @@ def root():
 @app.post("/run-experiment", response_model=ExperimentResponse)
 def run_experiment_api(request: ExperimentRequest):
     try:
-        config = ExperimentConfig(
-            scenario=request.scenario,
-            agent_type=request.agent_type,
-            episodes=request.episodes,
-            timesteps=request.timesteps,
-            reward_mode=request.reward_mode,
-            schedule=request.schedule,
-            schedule_length=request.schedule_length,
-            drawdown_coeff=request.drawdown_coeff,
-            volatility_coeff=request.volatility_coeff,
-            trade_penalty_coeff=request.trade_penalty_coeff,
-            invalid_action_penalty=request.invalid_action_penalty,
-            inactivity_penalty=request.inactivity_penalty,
-            trade_size=request.trade_size,
-        )
-
-        result = run_configured_experiment(config)
+        config = request_config(request)
+
+        result = run_configured_experiment(config, cache=result_cache)
         return {"result": result}
 
     except Exception as e:
@@ -73,21 +92,7 @@ def run_experiment_stream(request: ExperimentRequest):
     def worker():
         try:
             emit({"type": "log", "message": "> run started"})
-            config = ExperimentConfig(
-                scenario=request.scenario,
-                agent_type=request.agent_type,
-                episodes=request.episodes,
-                timesteps=request.timesteps,
-                reward_mode=request.reward_mode,
-                schedule=request.schedule,
-                schedule_length=request.schedule_length,
-                drawdown_coeff=request.drawdown_coeff,
-                volatility_coeff=request.volatility_coeff,
-                trade_penalty_coeff=request.trade_penalty_coeff,
-                invalid_action_penalty=request.invalid_action_penalty,
-                inactivity_penalty=request.inactivity_penalty,
-                trade_size=request.trade_size,
-            )
+            config = request_config(request)
             if request.agent_type != "ppo":
                 emit({"type": "progress", "pct": 0.0})
             result = run_configured_experiment(
@@ -95,6 +100,7 @@ def run_experiment_stream(request: ExperimentRequest):
                 progress=True,
                 log_every=1000,
                 progress_hook=progress_hook,
+                cache=result_cache,
             )
             emit({"type": "progress", "pct": 100.0})
             emit({"type": "result", "result": result})
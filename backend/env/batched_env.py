@@ -0,0 +1,179 @@
+import numpy as np
+
+
+class BatchedMarketEnvironment:
+    """
+    Steps many independent episodes at once, over one shared price
+    series (shape (T,)) or one row per episode (shape (n_episodes, T),
+    e.g. from gbm_paths).
+
+    Per-episode state (cash, holdings, peak value, trade counters) is kept
+    as NumPy arrays of shape (n_episodes,). Rewards match
+    MarketEnvironment.step for every episode in the batch.
+    """
+
+    def __init__(
+        self,
+        prices,
+        n_episodes,
+        initial_cash=10000,
+        trade_size=1,
+        reward_mode="raw",
+        drawdown_coeff=0.01,
+        volatility_coeff=0.01,
+        trade_penalty_coeff=0.0,
+        invalid_action_penalty=0.0,
+        inactivity_penalty=0.0,
+    ):
+        self.prices = np.asarray(prices, dtype=np.float64)
+        if self.prices.ndim not in (1, 2) or self.prices.shape[-1] < 2:
+            raise ValueError(
+                "Need a 1-D price series or a (n_episodes, T) matrix "
+                "with at least 2 prices."
+            )
+        self.n_episodes = int(n_episodes)
+        if self.prices.ndim == 2 and len(self.prices) != self.n_episodes:
+            raise ValueError(
+                f"Price matrix has {len(self.prices)} rows for "
+                f"{self.n_episodes} episodes."
+            )
+        # Indexed by timestep: a scalar price, or (as a view of the
+        # matrix) one price per episode.
+        self._step_prices = self.prices.T
+        self.initial_cash = initial_cash
+        self.trade_size = trade_size
+        self.state_dim = 4
+        self.reward_mode = reward_mode
+        self.drawdown_coeff = drawdown_coeff
+        self.volatility_coeff = volatility_coeff
+        self.trade_penalty_coeff = trade_penalty_coeff
+        self.invalid_action_penalty = invalid_action_penalty
+        self.inactivity_penalty = inactivity_penalty
+
+        self.timestep = None
+        self.done = None
+        self.cash = None
+        self.holdings = None
+        self.max_portfolio_value = None
+        self.trade_count = None
+        self.executed_trades = None
+        self.reset()
+
+    def reset(self):
+        n = self.n_episodes
+        self.timestep = 0
+        self.done = False
+        self.cash = np.full(n, self.initial_cash, dtype=np.float64)
+        self.holdings = np.zeros(n, dtype=np.int64)
+        self.max_portfolio_value = np.full(
+            n, self.initial_cash, dtype=np.float64
+        )
+        self.trade_count = np.zeros(n, dtype=np.int64)
+        self.executed_trades = np.zeros(n, dtype=np.int64)
+        return self._get_state()
+
+    def step(self, actions):
+        """
+        actions: integer array of shape (n_episodes,)
+        0 = HOLD, 1 = BUY, 2 = SELL
+        """
+        reward, current_value = self._advance(actions)
+        return self._get_state(current_value), reward, self.done
+
+    def step_array(self, actions, out):
+        """
+        Same as step(), but writes price, cash, holdings and portfolio
+        value rows into a caller-owned (4, n_episodes) buffer instead of
+        building a state dict with copies of the arrays.
+        """
+        reward, current_value = self._advance(actions)
+        out[0] = self._step_prices[self.timestep]
+        out[1] = self.cash
+        out[2] = self.holdings
+        out[3] = current_value
+        return reward, self.done
+
+    def write_state(self, out):
+        price = self._step_prices[self.timestep]
+        out[0] = price
+        out[1] = self.cash
+        out[2] = self.holdings
+        out[3] = self._portfolio_value(price)
+        return out
+
+    def _advance(self, actions):
+        if self.done:
+            raise RuntimeError("Episode has ended. Call reset().")
+
+        actions = np.asarray(actions)
+        current_price = self._step_prices[self.timestep]
+        prev_value = self.cash + self.holdings * current_price
+
+        # Execute actions
+        cost = current_price * self.trade_size
+        wants_buy = actions == 1
+        wants_sell = actions == 2
+        buy = wants_buy & (self.cash >= cost)
+        sell = wants_sell & (self.holdings >= self.trade_size)
+        traded = buy | sell
+        invalid_action = (wants_buy | wants_sell) & ~traded
+
+        np.subtract(self.cash, cost, out=self.cash, where=buy)
+        self.holdings[buy] += self.trade_size
+        np.add(self.cash, cost, out=self.cash, where=sell)
+        self.holdings[sell] -= self.trade_size
+
+        # Move to next timestep
+        self.timestep += 1
+        if self.timestep >= self.prices.shape[-1] - 1:
+            self.done = True
+
+        next_price = self._step_prices[self.timestep]
+        current_value = self.cash + self.holdings * next_price
+
+        raw_reward = current_value - prev_value
+        np.maximum(
+            self.max_portfolio_value,
+            current_value,
+            out=self.max_portfolio_value,
+        )
+
+        inactivity_penalty = np.where(traded, 0.0, self.inactivity_penalty)
+        invalid_penalty = np.where(
+            invalid_action, self.invalid_action_penalty, 0.0
+        )
+
+        if self.reward_mode == "risk_adjusted":
+            drawdown = self.max_portfolio_value - current_value
+            volatility = abs(next_price - current_price)
+            trade_penalty = np.where(traded, self.trade_penalty_coeff, 0.0)
+            reward = (
+                raw_reward
+                - self.drawdown_coeff * drawdown
+                - self.volatility_coeff * volatility
+                - trade_penalty
+                - invalid_penalty
+                - inactivity_penalty
+            )
+        else:
+            reward = raw_reward - invalid_penalty - inactivity_penalty
+
+        self.trade_count += traded
+        self.executed_trades += traded
+
+        return reward, current_value
+
+    def _portfolio_value(self, price):
+        return self.cash + self.holdings * price
+
+    def _get_state(self, portfolio_value=None):
+        price = self._step_prices[self.timestep]
+        if portfolio_value is None:
+            portfolio_value = self._portfolio_value(price)
+        return {
+            "timestep": self.timestep,
+            "price": price,
+            "cash": self.cash.copy(),
+            "holdings": self.holdings.copy(),
+            "portfolio_value": portfolio_value,
+        }
@@ -31,6 +31,7 @@ class MarketEnvironment:
         self.inactivity_penalty = inactivity_penalty
 
         self.max_portfolio_value = None
+        self.portfolio_value = None
         self.prev_price = None
         self.trade_count = None
         self.executed_trades = None
@@ -45,6 +46,7 @@ class MarketEnvironment:
         self.prev_price = self.prices[0]
         self.trade_count = 0
         self.executed_trades = 0
+        self.portfolio_value = self._portfolio_value(self.prices[0])
         return self._get_state()
 
     def step(self, action):
@@ -54,11 +56,44 @@ class MarketEnvironment:
         1 = BUY
         2 = SELL
         """
+        reward, next_price, current_value = self._advance(action)
+        state = {
+            "timestep": self.timestep,
+            "price": next_price,
+            "cash": self.cash,
+            "holdings": self.holdings,
+            "portfolio_value": current_value,
+        }
+        return state, reward, self.done
+
+    def step_array(self, action, out):
+        """
+        Same as step(), but writes price, cash, holdings and portfolio
+        value into a caller-owned buffer of length 4 instead of
+        building a state dict.
+        """
+        reward, next_price, current_value = self._advance(action)
+        out[0] = next_price
+        out[1] = self.cash
+        out[2] = self.holdings
+        out[3] = current_value
+        return reward, self.done
+
+    def write_state(self, out):
+        price = self.prices[self.timestep]
+        out[0] = price
+        out[1] = self.cash
+        out[2] = self.holdings
+        out[3] = self._portfolio_value(price)
+        return out
+
+    def _advance(self, action):
         if self.done:
             raise RuntimeError("Episode has ended. Call reset().")
 
         current_price = self.prices[self.timestep]
-        prev_value = self._portfolio_value(current_price)
+        # Last step's mark-to-market value, same cash/holdings/price.
+        prev_value = self.portfolio_value
 
         # Execute action
         traded = False
@@ -89,6 +124,7 @@ class MarketEnvironment:
         current_value = self._portfolio_value(next_price)
 
         raw_reward = current_value - prev_value
+        self.portfolio_value = current_value
         self.max_portfolio_value = max(self.max_portfolio_value, current_value)
 
         inactivity_penalty = (
@@ -119,9 +155,8 @@ class MarketEnvironment:
             self.trade_count += 1
             self.executed_trades += 1
         self.prev_price = next_price
-        state = self._get_state()
 
-        return state, reward, self.done
+        return reward, next_price, current_value
 
     def _portfolio_value(self, price):
         return self.cash + self.holdings * price
@@ -135,4 +170,3 @@ class MarketEnvironment:
             "holdings": self.holdings,
             "portfolio_value": self._portfolio_value(price),
         }
-    
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class MultiAssetMarketEnvironment:
     """
     Multi-asset financial environment with
@@ -8,19 +11,25 @@ class MultiAssetMarketEnvironment:
 
     def __init__(self, price_matrix, initial_cash=10000, trade_size=1):
         """
-        price_matrix: list of lists
+        price_matrix: array-like
             shape = (num_assets, timesteps)
         """
-        self.prev_prices = None
         self.trade_count = None
+        self.executed_trades = None
         self.holdings = None
         self.done = None
         self.cash = None
         self.timestep = None
         self.max_portfolio_value = None
-        self.price_matrix = price_matrix
-        self.num_assets = len(price_matrix)
-        self.timesteps = len(price_matrix[0])
+        self.portfolio_value = None
+        self.price_matrix = np.ascontiguousarray(
+            price_matrix, dtype=np.float64
+        )
+        if self.price_matrix.ndim != 2:
+            raise ValueError(
+                "price_matrix must have shape (num_assets, timesteps)."
+            )
+        self.num_assets, self.timesteps = self.price_matrix.shape
 
         self.initial_cash = initial_cash
         self.trade_size = trade_size
@@ -31,28 +40,47 @@ class MultiAssetMarketEnvironment:
         # State: (price_i, holding_i) * N + cash + portfolio_value
         self.state_dim = 2 * self.num_assets + 2
 
+        # Summed |price move| across assets for each step t -> t + 1
+        self.step_volatility = np.abs(
+            np.diff(self.price_matrix, axis=1)
+        ).sum(axis=0)
+
         self.reset()
 
     def reset(self):
         self.timestep = 0
         self.cash = self.initial_cash
-        self.holdings = [0 for _ in range(self.num_assets)]
+        self.holdings = np.zeros(self.num_assets, dtype=np.int64)
         self.done = False
 
         # --- Risk & behavior tracking ---
         self.max_portfolio_value = self.initial_cash
         self.trade_count = 0
-        self.prev_prices = [
-            self.price_matrix[i][0] for i in range(self.num_assets)
-        ]
+        self.executed_trades = 0
+        self.portfolio_value = self._portfolio_value()
 
         return self._get_state()
 
     def step(self, action):
+        reward = self._advance(action)
+        return self._get_state(), reward, self.done
+
+    def step_array(self, action, out):
+        """
+        Same as step(), but writes the state into a caller-owned
+        buffer of length state_dim instead of allocating one.
+        """
+        reward = self._advance(action)
+        self.write_state(out)
+        return reward, self.done
+
+    def _advance(self, action):
         if self.done:
             raise RuntimeError("Episode finished. Call reset().")
 
-        prev_value = self._portfolio_value()
+        # Trades execute at the current price, so they leave the
+        # mark-to-market value unchanged.
+        prev_value = self.portfolio_value
 
         # --- Decode action ---
         if action != self.ACTION_HOLD:
@@ -61,17 +89,19 @@ class MultiAssetMarketEnvironment:
             asset_id = (action - 1) // 2
             is_buy = (action - 1) % 2 == 0
 
-            price = self.price_matrix[asset_id][self.timestep]
+            price = self.price_matrix[asset_id, self.timestep]
 
             if is_buy:
                 cost = price * self.trade_size
                 if self.cash >= cost:
                     self.cash -= cost
                     self.holdings[asset_id] += self.trade_size
+                    self.executed_trades += 1
             else:
                 if self.holdings[asset_id] >= self.trade_size:
                     self.cash += price * self.trade_size
                     self.holdings[asset_id] -= self.trade_size
+                    self.executed_trades += 1
 
         # --- Advance time ---
         self.timestep += 1
@@ -80,6 +110,7 @@ class MultiAssetMarketEnvironment:
 
         # --- Portfolio update ---
         current_value = self._portfolio_value()
+        self.portfolio_value = current_value
         self.max_portfolio_value = max(
             self.max_portfolio_value, current_value
         )
@@ -87,12 +118,7 @@ class MultiAssetMarketEnvironment:
         # --- Risk penalties ---
         drawdown = self.max_portfolio_value - current_value
         trade_penalty = self.trade_count * 0.1
-
-        volatility = 0.0
-        for i in range(self.num_assets):
-            price = self.price_matrix[i][self.timestep]
-            volatility += abs(price - self.prev_prices[i])
-            self.prev_prices[i] = price
+        volatility = self.step_volatility[self.timestep - 1]
 
         # --- Final reward ---
         reward = (
@@ -102,22 +128,19 @@ class MultiAssetMarketEnvironment:
             - 0.01 * volatility
         )
 
-        return self._get_state(), reward, self.done
+        return float(reward)
 
     def _portfolio_value(self):
-        value = self.cash
-        for i in range(self.num_assets):
-            price = self.price_matrix[i][self.timestep]
-            value += self.holdings[i] * price
-        return value
+        prices = self.price_matrix[:, self.timestep]
+        return self.cash + float(np.dot(self.holdings, prices))
+
+    def write_state(self, out):
+        n = self.num_assets
+        out[0:2 * n:2] = self.price_matrix[:, self.timestep]
+        out[1:2 * n:2] = self.holdings
+        out[-2] = self.cash
+        out[-1] = self.portfolio_value
+        return out
 
     def _get_state(self):
-        state = []
-        for i in range(self.num_assets):
-            state.append(self.price_matrix[i][self.timestep])
-            state.append(self.holdings[i])
-
-        state.append(self.cash)
-        state.append(self._portfolio_value())
-        return state
-    
\ No newline at end of file
+        return self.write_state(np.empty(self.state_dim, dtype=np.float64))
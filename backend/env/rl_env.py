@@ -2,6 +2,7 @@ import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
 from backend.env.market_env import MarketEnvironment
+from backend.env.multi_asset_env import MultiAssetMarketEnvironment
 
 
 class RLMarketEnv(gym.Env):
@@ -43,33 +44,67 @@ class RLMarketEnv(gym.Env):
             dtype=np.float32,
         )
 
-    @staticmethod
-    def _state_to_array(state):
-        return np.array(
-            [
-                state["price"],
-                state["cash"],
-                state["holdings"],
-                state["portfolio_value"],
-            ],
-            dtype=np.float32,
-        )
+        self._obs = None
 
     def reset(self, seed=None, options=None):
-        state = self.env.reset()
-        return self._state_to_array(state), {}
+        self.env.reset()
+        # Fresh buffer per episode so a terminal observation held by the
+        # caller is not overwritten by the next episode.
+        self._obs = np.empty(4, dtype=np.float32)
+        return self.env.write_state(self._obs), {}
 
     def step(self, action):
-        state, reward, done = self.env.step(action)
+        reward, done = self.env.step_array(action, self._obs)
 
         terminated = done
         truncated = False  # no time-limit truncation yet
         info = {}
 
         return (
-            self._state_to_array(state),
+            self._obs,
             reward,
             terminated,
             truncated,
             info,
         )
+
+
+class RLMultiAssetEnv(gym.Env):
+    """
+    Gym-compatible wrapper around MultiAssetMarketEnvironment.
+    Observations are written into one preallocated float32 buffer.
+    """
+
+    metadata = {"render.modes": []}
+
+    def __init__(self, price_matrix, trade_size=1):
+        super().__init__()
+        self.env = MultiAssetMarketEnvironment(
+            price_matrix, trade_size=trade_size
+        )
+
+        self.action_space = spaces.Discrete(self.env.action_space_size)
+
+        self.observation_space = spaces.Box(
+            low=0,
+            high=np.inf,
+            shape=(self.env.state_dim,),
+            dtype=np.float32,
+        )
+        self._obs = None
+
+    def reset(self, seed=None, options=None):
+        self.env.reset()
+        # Fresh buffer per episode so a terminal observation held by the
+        # caller is not overwritten by the next episode.
+        self._obs = np.empty(self.env.state_dim, dtype=np.float32)
+        return self.env.write_state(self._obs), {}
+
+    def step(self, action):
+        reward, done = self.env.step_array(int(action), self._obs)
+
+        terminated = done
+        truncated = False
+        info = {}
+
+        return self._obs, reward, terminated, truncated, info
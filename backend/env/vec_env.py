@@ -0,0 +1,103 @@
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env import VecEnv
+
+from backend.env.batched_env import BatchedMarketEnvironment
+
+
+class RLMarketVecEnv(VecEnv):
+    """
+    SB3 VecEnv that advances N copies of the market in one array step.
+
+    All copies share the same price series, so they terminate together and
+    are auto-reset together, following the VecEnv contract.
+    """
+
+    def __init__(
+        self,
+        prices,
+        n_envs=1,
+        reward_mode="raw",
+        drawdown_coeff=0.01,
+        volatility_coeff=0.01,
+        trade_penalty_coeff=0.0,
+        invalid_action_penalty=0.0,
+        inactivity_penalty=0.0,
+        trade_size=1,
+    ):
+        self.env = BatchedMarketEnvironment(
+            prices,
+            n_envs,
+            reward_mode=reward_mode,
+            drawdown_coeff=drawdown_coeff,
+            volatility_coeff=volatility_coeff,
+            trade_penalty_coeff=trade_penalty_coeff,
+            invalid_action_penalty=invalid_action_penalty,
+            inactivity_penalty=inactivity_penalty,
+            trade_size=trade_size,
+        )
+        self.render_mode = None
+        self._obs = np.zeros((n_envs, 4), dtype=np.float32)
+        self._actions = None
+
+        super().__init__(
+            n_envs,
+            spaces.Box(low=0, high=np.inf, shape=(4,), dtype=np.float32),
+            spaces.Discrete(3),
+        )
+
+    def reset(self):
+        self.env.reset()
+        # The env writes one row per state field into the transposed view.
+        self.env.write_state(self._obs.T)
+        obs = self._obs.copy()
+        self.reset_infos = [{} for _ in range(self.num_envs)]
+        return obs
+
+    def step_async(self, actions):
+        self._actions = np.asarray(actions).reshape(self.num_envs)
+
+    def step_wait(self):
+        rewards, done = self.env.step_array(self._actions, self._obs.T)
+        obs = self._obs.copy()
+        dones = np.full(self.num_envs, done, dtype=bool)
+
+        if done:
+            infos = [
+                {"terminal_observation": obs[i], "TimeLimit.truncated": False}
+                for i in range(self.num_envs)
+            ]
+            obs = self.reset()
+        else:
+            infos = [{} for _ in range(self.num_envs)]
+
+        return obs, rewards.astype(np.float32), dones, infos
+
+    def close(self):
+        pass
+
+    def get_attr(self, attr_name, indices=None):
+        indices = self._get_indices(indices)
+        if hasattr(self.env, attr_name):
+            value = getattr(self.env, attr_name)
+        else:
+            value = getattr(self, attr_name)
+        if isinstance(value, np.ndarray) and value.shape[:1] == (
+            self.num_envs,
+        ):
+            return [value[i] for i in indices]
+        return [value for _ in indices]
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self.env, attr_name, value)
+
+    def env_method(
+        self, method_name, *method_args, indices=None, **method_kwargs
+    ):
+        indices = self._get_indices(indices)
+        method = getattr(self.env, method_name)
+        result = method(*method_args, **method_kwargs)
+        return [result for _ in indices]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
@@ -0,0 +1,193 @@
+import numpy as np
+
+from backend.agents.random_agent import RandomAgent
+from backend.simulations.jit_kernel import fill_binding_stretch
+
+
+# Steps in the first closed-form window after a repair; each window that
+# fills without a rejection doubles the next, up to MAX_WINDOW.
+MIN_WINDOW = 256
+MAX_WINDOW = 1 << 16
+# Rejection-free steps after which a binding stretch is considered over.
+QUIET_STEPS = 64
+
+
+def policy_actions(agent_type, prices, seed=None):
+    """
+    Action array for baseline agents whose decisions depend only on the
+    price series, one action per step (len(prices) - 1).
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    n_steps = len(prices) - 1
+    if agent_type == "rule_based":
+        # HOLD on the first step, then follow the last price move.
+        moves = np.sign(np.diff(prices[:n_steps]))
+        actions = np.zeros(n_steps, dtype=np.int8)
+        actions[1:][moves > 0] = 1
+        actions[1:][moves < 0] = 2
+        return actions
+    if agent_type == "buy_and_hold":
+        actions = np.zeros(n_steps, dtype=np.int8)
+        actions[:1] = 1
+        return actions
+    if agent_type == "random":
+        return _random_actions(RandomAgent(seed=seed), n_steps)
+    raise ValueError(f"Unknown agent type: {agent_type}")
+
+
+def _random_actions(agent, n_steps):
+    """
+    The next n_steps agent.act() results, drawn in bulk. choice() keeps
+    the top k bits of one 32-bit Mersenne Twister word per draw and
+    redraws values past the action space; getrandbits(32 * m) returns m
+    such words in draw order, least significant first.
+    """
+    space = np.asarray(agent.action_space, dtype=np.int8)
+    n = len(space)
+    shift = 32 - n.bit_length()
+    picks = np.empty(0, dtype=np.uint32)
+    while len(picks) < n_steps:
+        # At least half of all draws are accepted.
+        m = 2 * (n_steps - len(picks)) + 64
+        words = np.frombuffer(
+            agent.rng.getrandbits(32 * m).to_bytes(4 * m, "little"),
+            dtype="<u4",
+        )
+        draws = words >> shift
+        picks = np.concatenate([picks, draws[draws < n]])
+    return space[picks[:n_steps]]
+
+
+def fill_positions(exec_prices, actions, initial_cash, trade_size):
+    """
+    Post-trade cash, holdings and executed-trade mask per step.
+
+    Sells against empty holdings are resolved in closed form: the lot
+    count is a cumulative sum reflected at zero. Buys are assumed to fill
+    within a window of steps; from the first one the cash constraint
+    rejects, orders are filled step by step until buys stop being
+    rejected, then the closed form resumes. Windows grow while they fill
+    cleanly and are capped at MAX_WINDOW, so no step is recomputed more
+    than a bounded number of times.
+    """
+    exec_prices = np.ascontiguousarray(exec_prices, dtype=np.float64)
+    actions = np.ascontiguousarray(actions)
+    n_steps = len(actions)
+    cash_out = np.empty(n_steps, dtype=np.float64)
+    holdings_out = np.empty(n_steps, dtype=np.int64)
+    traded_out = np.zeros(n_steps, dtype=bool)
+    out = (cash_out, holdings_out, traded_out)
+
+    cash = float(initial_cash)
+    holdings = 0
+    start = 0
+    window = MIN_WINDOW
+    while start < n_steps:
+        stop = min(start + window, n_steps)
+        seg_actions = actions[start:stop]
+        seg_len = stop - start
+        # Lots held (holdings / trade_size) with sells floored at zero.
+        lots = holdings // trade_size + np.cumsum(
+            (seg_actions == 1).astype(np.int64)
+            - (seg_actions == 2).astype(np.int64)
+        )
+        lots -= np.minimum(np.minimum.accumulate(lots), 0)
+        prev_lots = np.empty_like(lots)
+        prev_lots[0] = holdings // trade_size
+        prev_lots[1:] = lots[:-1]
+        delta = (lots - prev_lots) * trade_size
+        seg_holdings = lots * trade_size
+
+        # Prepend the opening cash so the cumsum adds in step order.
+        flows = np.empty(seg_len + 1, dtype=np.float64)
+        flows[0] = cash
+        flows[1:] = -(exec_prices[start:stop] * delta)
+        seg_cash = np.cumsum(flows)[1:]
+
+        rejected = (seg_actions == 1) & (seg_cash < 0)
+        k = int(np.argmax(rejected)) if rejected.any() else seg_len
+
+        end = start + k
+        cash_out[start:end] = seg_cash[:k]
+        holdings_out[start:end] = seg_holdings[:k]
+        traded_out[start:end] = delta[:k] != 0
+        if k > 0:
+            cash = float(seg_cash[k - 1])
+            holdings = int(seg_holdings[k - 1])
+        if k == seg_len:
+            start = stop
+            window = min(2 * window, MAX_WINDOW)
+            continue
+
+        start, cash, holdings = fill_binding_stretch(
+            exec_prices, actions, trade_size, cash, holdings, end,
+            QUIET_STEPS, out,
+        )
+        window = MIN_WINDOW
+
+    return cash_out, holdings_out, traded_out
+
+
+def backtest(
+    prices,
+    actions,
+    initial_cash=10000,
+    trade_size=1,
+    reward_mode="raw",
+    drawdown_coeff=0.01,
+    volatility_coeff=0.01,
+    trade_penalty_coeff=0.0,
+    invalid_action_penalty=0.0,
+    inactivity_penalty=0.0,
+):
+    """
+    Vectorized equivalent of stepping MarketEnvironment through a fixed
+    action array. Returns per-step arrays aligned with the step loop.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    actions = np.asarray(actions)
+    if len(prices) < 2:
+        raise ValueError("Need at least 2 prices for evaluation.")
+    if len(actions) != len(prices) - 1:
+        raise ValueError("Need one action per step (len(prices) - 1).")
+
+    exec_prices = prices[:-1]
+    next_prices = prices[1:]
+    cash, holdings, traded = fill_positions(
+        exec_prices, actions, initial_cash, trade_size
+    )
+
+    values = cash + holdings * next_prices
+    prev_values = np.empty_like(values)
+    prev_values[0] = initial_cash
+    prev_values[1:] = values[:-1]
+    raw_reward = values - prev_values
+
+    invalid_action = (actions != 0) & ~traded
+    inactivity = np.where(traded, 0.0, inactivity_penalty)
+    invalid = np.where(invalid_action, invalid_action_penalty, 0.0)
+
+    if reward_mode == "risk_adjusted":
+        peak = np.maximum(np.maximum.accumulate(values), initial_cash)
+        drawdown = peak - values
+        step_volatility = np.abs(next_prices - exec_prices)
+        trade_penalty = np.where(traded, trade_penalty_coeff, 0.0)
+        rewards = (
+            raw_reward
+            - drawdown_coeff * drawdown
+            - volatility_coeff * step_volatility
+            - trade_penalty
+            - invalid
+            - inactivity
+        )
+    else:
+        rewards = raw_reward - invalid - inactivity
+
+    return {
+        "cash": cash,
+        "holdings": holdings,
+        "values": values,
+        "rewards": rewards,
+        "traded": traded,
+        "executed_trades": int(traded.sum()),
+    }
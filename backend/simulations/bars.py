@@ -0,0 +1,82 @@
+import re
+
+import numpy as np
+
+
+_FREQ_UNITS_NS = {
+    "ms": 1_000_000,
+    "s": 1_000_000_000,
+    "m": 60_000_000_000,
+    "min": 60_000_000_000,
+    "h": 3_600_000_000_000,
+    "d": 86_400_000_000_000,
+}
+_FREQ_RE = re.compile(r"^\s*(\d*)\s*([a-zA-Z]+)\s*$")
+
+
+def parse_freq(freq):
+    """
+    Bar width in nanoseconds for strings like "1s", "5m", "15min", "1h",
+    "1d" (a missing count means 1).
+    """
+    match = _FREQ_RE.match(str(freq))
+    unit = match.group(2).lower() if match else None
+    if unit not in _FREQ_UNITS_NS:
+        raise ValueError(f"Unknown bar frequency: {freq}")
+    count = int(match.group(1) or 1)
+    if count <= 0:
+        raise ValueError(f"Bar frequency must be positive: {freq}")
+    return count * _FREQ_UNITS_NS[unit]
+
+
+def aggregate_bars(timestamps, prices, freq, volumes=None):
+    """
+    Resample date-sorted ticks into OHLCV bars aligned to multiples of
+    `freq` since the epoch.
+
+    timestamps are int64 epoch nanoseconds. Bars are only emitted for
+    intervals that contain ticks. Volume sums `volumes` when given,
+    otherwise it counts ticks. Returns a dict of arrays: timestamps (bar
+    start), open, high, low, close, volume.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    prices = np.asarray(prices, dtype=np.float64)
+    if len(timestamps) != len(prices):
+        raise ValueError("Need one timestamp per price.")
+    if np.any(timestamps[1:] < timestamps[:-1]):
+        raise ValueError("Timestamps must be sorted to build bars.")
+    width = parse_freq(freq)
+
+    if len(prices) == 0:
+        empty = np.empty(0, dtype=np.float64)
+        return {
+            "timestamps": np.empty(0, dtype=np.int64),
+            "open": empty,
+            "high": empty,
+            "low": empty,
+            "close": empty,
+            "volume": empty,
+        }
+
+    buckets = timestamps // width
+    starts = np.flatnonzero(
+        np.concatenate(([True], buckets[1:] != buckets[:-1]))
+    )
+    ends = np.empty_like(starts)
+    ends[:-1] = starts[1:] - 1
+    ends[-1] = len(prices) - 1
+
+    if volumes is None:
+        volume = np.diff(np.append(starts, len(prices))).astype(np.float64)
+    else:
+        volume = np.add.reduceat(
+            np.asarray(volumes, dtype=np.float64), starts
+        )
+    return {
+        "timestamps": buckets[starts] * width,
+        "open": prices[starts],
+        "high": np.maximum.reduceat(prices, starts),
+        "low": np.minimum.reduceat(prices, starts),
+        "close": prices[ends],
+        "volume": volume,
+    }
@@ -0,0 +1,117 @@
+import numpy as np
+
+
+# Upper bound on resample-by-observation cells held in memory at once.
+BLOCK_CELLS = 1 << 22
+
+
+def bootstrap_means(values, n_resamples=10_000, seed=0):
+    """
+    Bootstrap distribution of column means for an (n, m) matrix.
+
+    Resamples are drawn as an index matrix and turned into per-row
+    counts, so every column is resampled with the same draws and the
+    means come out of one matrix product. NaNs are ignored per column.
+    Returns an (n_resamples, m) array.
+    """
+    values = _as_matrix(values)
+    n = values.shape[0]
+    if n == 0:
+        return np.full((n_resamples, values.shape[1]), np.nan)
+
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    rng = np.random.default_rng(seed)
+
+    means = np.empty((n_resamples, values.shape[1]), dtype=np.float64)
+    block = max(1, BLOCK_CELLS // n)
+    for start in range(0, n_resamples, block):
+        rows = min(block, n_resamples - start)
+        idx = rng.integers(0, n, size=(rows, n))
+        offsets = np.arange(rows)[:, None] * n
+        counts = np.bincount(
+            (idx + offsets).ravel(), minlength=rows * n
+        ).reshape(rows, n).astype(np.float64)
+        totals = counts @ filled
+        weights = counts @ valid
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means[start:start + rows] = totals / weights
+    return means
+
+
+def _as_matrix(values):
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    return values
+
+
+def _valid_counts(values):
+    return (~np.isnan(_as_matrix(values))).sum(axis=0)
+
+
+def _constant(values):
+    # Columns whose non-NaN values are all equal (or absent).
+    values = _as_matrix(values)
+    valid = ~np.isnan(values)
+    high = np.where(valid, values, -np.inf).max(axis=0, initial=-np.inf)
+    low = np.where(valid, values, np.inf).min(axis=0, initial=np.inf)
+    return high <= low
+
+
+def bootstrap_ci(values, n_resamples=10_000, ci=0.95, seed=0):
+    """
+    Percentile confidence interval for each column mean.
+    Returns (low, high) arrays of length m, NaN for columns with fewer
+    than two observations.
+    """
+    means = bootstrap_means(values, n_resamples=n_resamples, seed=seed)
+    tail = (1.0 - ci) / 2.0 * 100.0
+    with np.errstate(invalid="ignore"):
+        low, high = np.nanpercentile(means, [tail, 100.0 - tail], axis=0)
+    too_few = _valid_counts(values) < 2
+    return np.where(too_few, np.nan, low), np.where(too_few, np.nan, high)
+
+
+def _two_sided_pvalue(means):
+    # Share of the bootstrap distribution on the far side of zero.
+    finite = ~np.isnan(means)
+    n_finite = finite.sum(axis=0)
+    below = ((means <= 0) & finite).sum(axis=0)
+    above = ((means >= 0) & finite).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p = 2.0 * np.minimum(below, above) / n_finite
+    return np.where(n_finite > 0, np.minimum(p, 1.0), np.nan)
+
+
+def paired_bootstrap_pvalue(a, b, n_resamples=10_000, seed=0):
+    """
+    Two-sided bootstrap p-value that the mean paired difference a - b is
+    zero, per column. a and b are (n_pairs, m) matrices aligned by row.
+    NaN for columns with fewer than two pairs or constant differences,
+    where the bootstrap distribution says nothing about the spread.
+    """
+    diffs = np.asarray(a, dtype=np.float64) - np.asarray(b, dtype=np.float64)
+    means = bootstrap_means(diffs, n_resamples=n_resamples, seed=seed)
+    p = _two_sided_pvalue(means)
+    undefined = (_valid_counts(diffs) < 2) | _constant(diffs)
+    return np.where(undefined, np.nan, p)
+
+
+def bootstrap_pvalue(a, b, n_resamples=10_000, seed=0):
+    """
+    Two-sided bootstrap p-value that the means of two independent samples
+    are equal, per column. a is (n_a, m) and b is (n_b, m); each is
+    resampled on its own. NaN for columns where either sample has fewer
+    than two observations or both are constant.
+    """
+    seed_a, seed_b = np.random.SeedSequence(seed).spawn(2)
+    means = bootstrap_means(a, n_resamples=n_resamples, seed=seed_a)
+    means -= bootstrap_means(b, n_resamples=n_resamples, seed=seed_b)
+    p = _two_sided_pvalue(means)
+    undefined = (
+        (_valid_counts(a) < 2)
+        | (_valid_counts(b) < 2)
+        | (_constant(a) & _constant(b))
+    )
+    return np.where(undefined, np.nan, p)
@@ -1,37 +1,745 @@
 import csv
-from datetime import datetime
+import gzip
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 
+import numpy as np
 
-def load_prices_csv(
+try:
+    import zstandard
+except ImportError:  # optional, only needed for .zst inputs
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as pa_ds
+except ImportError:  # optional, only needed for Parquet/Feather inputs
+    pa = None
+
+
+# Bump when the cached array layout changes.
+CACHE_VERSION = 1
+CACHE_DIRNAME = ".price_cache"
+
+# Rows parsed into each NumPy block by the streaming reader.
+CHUNK_ROWS = 1 << 16
+
+COLUMNAR_FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".ipc": "feather",
+}
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _epoch_ns(value):
+    """
+    Nanoseconds since the Unix epoch; naive datetimes are taken as UTC.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - _EPOCH
+    return (
+        (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+    ) * 1_000
+
+
+def to_epoch_ns(value):
+    """
+    Epoch nanoseconds for a datetime, date or ISO string.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    return _epoch_ns(value)
+
+
+def _end_bound_ns(end):
+    """
+    Exclusive epoch-ns bound for an inclusive end: a date-only end (a
+    date or an ISO date string) keeps that whole day, so the bound is
+    the next midnight; a datetime end keeps rows up to that instant.
+    """
+    if isinstance(end, str):
+        try:
+            end = date.fromisoformat(end)
+        except ValueError:
+            return to_epoch_ns(end) + 1
+    if isinstance(end, datetime):
+        return to_epoch_ns(end) + 1
+    return to_epoch_ns(end + timedelta(days=1))
+
+
+def date_slice(timestamps, start=None, end=None):
+    """
+    slice of the rows with start <= date <= end, found by binary search
+    over sorted int64 epoch-ns timestamps (memory-mapped arrays are not
+    read beyond the probed entries). A date-only end includes the whole
+    day.
+    """
+    lo = 0
+    hi = len(timestamps)
+    if start is not None:
+        lo = int(np.searchsorted(timestamps, to_epoch_ns(start), "left"))
+    if end is not None:
+        hi = int(np.searchsorted(timestamps, _end_bound_ns(end), "left"))
+    return slice(lo, max(lo, hi))
+
+
+class _UnparsedDate(ValueError):
+    pass
+
+
+def _open_text(path):
+    """
+    Open a CSV for text reading, decompressing .gz and .zst/.zstd inputs.
+    """
+    lower = path.lower()
+    if lower.endswith(".gz"):
+        return gzip.open(path, "rt", newline="")
+    if lower.endswith((".zst", ".zstd")):
+        if zstandard is None:
+            raise ImportError(
+                "Reading .zst files requires the 'zstandard' package."
+            )
+        raw = open(path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            raw, closefd=True
+        )
+        return io.TextIOWrapper(reader, newline="")
+    return open(path, "r", newline="")
+
+
+def iter_price_chunks(
     path,
     price_col="Close",
     date_col=None,
+    chunk_rows=CHUNK_ROWS,
     max_rows=None,
 ):
-    rows = []
-    with open(path, "r", newline="") as f:
-        reader = csv.DictReader(f)
+    """
+    Stream a price CSV as (prices, timestamps) NumPy blocks of up to
+    chunk_rows rows, in file order. timestamps holds int64 epoch
+    nanoseconds, or is None without date_col. Rows with a non-numeric
+    price are skipped; dates must be ISO formatted. Parquet/Feather files
+    are streamed as record batches.
+    """
+    if columnar_format(path):
+        yield from _iter_columnar_chunks(
+            path, price_col, date_col, chunk_rows, max_rows
+        )
+        return
+    with _open_text(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if price_col not in header:
+            raise ValueError(f"Missing column '{price_col}' in {path}")
+        price_idx = header.index(price_col)
+        date_idx = header.index(date_col) if date_col in header else None
+        if date_col and date_idx is None:
+            raise ValueError(f"Missing column '{date_col}' in {path}")
+
+        prices = np.empty(chunk_rows, dtype=np.float64)
+        timestamps = None
+        if date_col:
+            timestamps = np.empty(chunk_rows, dtype=np.int64)
+        n = 0
+        total = 0
         for row in reader:
-            if price_col not in row:
+            try:
+                price = float(row[price_idx])
+            except (IndexError, ValueError):
+                continue
+            if date_col:
+                try:
+                    date_val = datetime.fromisoformat(row[date_idx])
+                except (IndexError, ValueError):
+                    raise _UnparsedDate(
+                        f"Unparseable date in column '{date_col}' of {path}"
+                    ) from None
+                timestamps[n] = _epoch_ns(date_val)
+            prices[n] = price
+            n += 1
+            total += 1
+            if n == chunk_rows:
+                yield prices, timestamps
+                prices = np.empty(chunk_rows, dtype=np.float64)
+                if date_col:
+                    timestamps = np.empty(chunk_rows, dtype=np.int64)
+                n = 0
+            if max_rows and total >= max_rows:
+                break
+
+        if n:
+            yield prices[:n], timestamps[:n] if date_col else None
+
+
+def iter_price_windows(
+    path,
+    window,
+    overlap=0,
+    price_col="Close",
+    date_col=None,
+    chunk_rows=CHUNK_ROWS,
+    max_rows=None,
+    drop_last=False,
+    start=None,
+    end=None,
+):
+    """
+    Yield price windows of `window` rows from a streamed CSV, each
+    starting `window - overlap` rows after the previous one so the
+    overlap can serve as warm-up. Memory stays around one chunk plus one
+    window. With date_col the file must already be in date order, and
+    start/end restrict the stream to that inclusive date range. The
+    trailing partial window is yielded unless drop_last is set.
+    """
+    if (start is not None or end is not None) and not date_col:
+        raise ValueError("Date filters need a date column.")
+    window = int(window)
+    overlap = int(overlap)
+    if window < 2:
+        raise ValueError("Window must be at least 2 rows.")
+    if not 0 <= overlap < window:
+        raise ValueError("Overlap must be in [0, window).")
+    stride = window - overlap
+
+    buffer = np.empty(0, dtype=np.float64)
+    last_ts = None
+    fresh = 0
+    for prices, timestamps in iter_price_chunks(
+        path, price_col, date_col, chunk_rows, max_rows
+    ):
+        if timestamps is not None and len(timestamps):
+            if (last_ts is not None and timestamps[0] < last_ts) or np.any(
+                timestamps[1:] < timestamps[:-1]
+            ):
                 raise ValueError(
-                    f"Missing column '{price_col}' in {path}"
+                    f"{path} is not sorted by '{date_col}'; "
+                    "use load_price_series for unsorted files."
                 )
+            last_ts = timestamps[-1]
+            rows = date_slice(timestamps, start, end)
+            prices = prices[rows]
+            # Sorted input: nothing after a chunk that ends past `end`.
+            past_end = rows.stop < len(timestamps)
+        else:
+            past_end = False
+        buffer = np.concatenate((buffer, prices))
+        fresh += len(prices)
+        while len(buffer) >= window:
+            yield buffer[:window].copy()
+            buffer = buffer[stride:]
+            fresh = len(buffer) - overlap
+        if past_end:
+            break
+
+    if not drop_last and fresh > 0 and len(buffer) >= 2:
+        yield buffer.copy()
+
+
+def _parse_raw_dates(path, price_col, date_col, max_rows):
+    # Fallback for date columns that are not ISO formatted: sort on the
+    # raw values like the original list-based loader.
+    prices = []
+    dates = []
+    with _open_text(path) as f:
+        for row in csv.DictReader(f):
             try:
                 price = float(row[price_col])
             except (TypeError, ValueError):
                 continue
-            if date_col:
-                try:
-                    date_val = datetime.fromisoformat(row[date_col])
-                except (TypeError, ValueError):
-                    date_val = row[date_col]
-                rows.append((date_val, price))
-            else:
-                rows.append(price)
-            if max_rows and len(rows) >= max_rows:
+            try:
+                date_val = datetime.fromisoformat(row[date_col])
+            except (TypeError, ValueError):
+                date_val = row[date_col]
+            prices.append(price)
+            dates.append(date_val)
+            if max_rows and len(prices) >= max_rows:
                 break
+    order = sorted(range(len(dates)), key=dates.__getitem__)
+    return np.array(prices, dtype=np.float64)[order]
+
+
+def _parse_prices_csv(path, price_col, date_col, max_rows):
+    """
+    Parse the CSV into (prices, timestamps) via the chunked reader,
+    sorting by date only when the file is not already in order.
+    Timestamps are None without a parseable date column.
+    """
+    try:
+        chunks = list(
+            iter_price_chunks(path, price_col, date_col, max_rows=max_rows)
+        )
+    except _UnparsedDate:
+        return _parse_raw_dates(path, price_col, date_col, max_rows), None
+
+    prices = np.concatenate(
+        [p for p, _ in chunks] or [np.empty(0, dtype=np.float64)]
+    )
+    if not date_col:
+        return prices, None
+    timestamps = np.concatenate(
+        [t for _, t in chunks] or [np.empty(0, dtype=np.int64)]
+    )
+    if np.any(timestamps[1:] < timestamps[:-1]):
+        order = np.argsort(timestamps, kind="stable")
+        prices = prices[order]
+        timestamps = timestamps[order]
+    return prices, timestamps
+
+
+def columnar_format(path):
+    """
+    pyarrow dataset format for Parquet/Feather paths, else None.
+    """
+    return COLUMNAR_FORMATS.get(os.path.splitext(path)[1].lower())
 
+
+# Nanoseconds per stored unit of Arrow timestamp columns; date32 stores
+# days and date64 milliseconds.
+_UNIT_NS = {"s": 10**9, "ms": 10**6, "us": 10**3, "ns": 1}
+_DAY_NS = 86_400 * 10**9
+
+
+def _date_filter(date_col, field_type, start, end):
+    """
+    Dataset filter for start <= date <= end (a date-only end includes
+    the whole day). Bounds are built in the column's own timestamp unit
+    (and tz) or date type, so Parquet row-group statistics still prune;
+    tz-aware columns store UTC, matching the epoch-ns bounds. String
+    columns are cast to ns timestamps so they match the same rows as the
+    parsed timestamps.
+    """
+    field = pc.field(date_col)
+    if pa.types.is_timestamp(field_type):
+        bound_type, unit_ns = field_type, _UNIT_NS[field_type.unit]
+    elif pa.types.is_date32(field_type):
+        bound_type, unit_ns = field_type, _DAY_NS
+    elif pa.types.is_date64(field_type):
+        bound_type, unit_ns = field_type, _UNIT_NS["ms"]
+    else:
+        bound_type, unit_ns = pa.timestamp("ns"), 1
+        field = field.cast(bound_type)
+
+    def bound(ns):
+        # First stored value at or after ns, so both comparisons are
+        # exact in whole units.
+        return pa.scalar(-(-ns // unit_ns), type=bound_type)
+
+    expr = pc.scalar(True)
+    if start is not None:
+        expr &= field >= bound(to_epoch_ns(start))
+    if end is not None:
+        expr &= field < bound(_end_bound_ns(end))
+    return expr
+
+
+def _timestamps_ns(column):
+    # Strings and dates go through Arrow's ISO-8601 cast; tz-aware
+    # timestamps are stored as UTC so the int64 view is epoch-ns already.
+    if not pa.types.is_timestamp(column.type):
+        column = pc.cast(column, pa.timestamp("ns"))
+    elif column.type.unit != "ns":
+        column = pc.cast(column, pa.timestamp("ns", column.type.tz))
+    return pc.cast(column, pa.int64()).to_numpy()
+
+
+def _columnar_dataset(path, price_col, date_col):
+    if pa is None:
+        raise ImportError(
+            "Reading Parquet/Feather files requires the 'pyarrow' package."
+        )
+    fmt = columnar_format(path)
+    if fmt is None:
+        raise ValueError(f"Not a Parquet/Feather file: {path}")
+    dataset = pa_ds.dataset(path, format=fmt)
+    names = dataset.schema.names
+    for col in (price_col, date_col):
+        if col and col not in names:
+            raise ValueError(f"Missing column '{col}' in {path}")
+    expr = pc.field(price_col).is_valid()
     if date_col:
-        rows.sort(key=lambda item: item[0])
-        return [price for _, price in rows]
-    return rows
+        expr &= pc.field(date_col).is_valid()
+    return dataset, expr
+
+
+def _iter_columnar_chunks(path, price_col, date_col, chunk_rows, max_rows):
+    dataset, expr = _columnar_dataset(path, price_col, date_col)
+    columns = [price_col] + ([date_col] if date_col else [])
+    remaining = max_rows or None
+    for batch in dataset.to_batches(
+        columns=columns, filter=expr, batch_size=chunk_rows
+    ):
+        if remaining is not None:
+            batch = batch.slice(0, remaining)
+            remaining -= len(batch)
+        if len(batch):
+            prices = pc.cast(batch.column(price_col), pa.float64())
+            timestamps = None
+            if date_col:
+                timestamps = _timestamps_ns(batch.column(date_col))
+            yield prices.to_numpy(zero_copy_only=False), timestamps
+        if remaining == 0:
+            break
+
+
+def load_columnar_prices(
+    path,
+    price_col="Close",
+    date_col=None,
+    max_rows=None,
+    start=None,
+    end=None,
+):
+    """
+    Load (prices, timestamps) from a Parquet or Feather file, reading only
+    the price and date columns. start/end (datetime or ISO string,
+    inclusive) are pushed down as a dataset filter, so Parquet row groups
+    outside the range are skipped from their statistics (string and date
+    columns are cast per row instead). Single-chunk, null-free float64
+    columns come back without a copy.
+    """
+    if (start is not None or end is not None) and not date_col:
+        raise ValueError("Date filters need a date column.")
+    dataset, expr = _columnar_dataset(path, price_col, date_col)
+    if date_col and (start is not None or end is not None):
+        field_type = dataset.schema.field(date_col).type
+        expr &= _date_filter(date_col, field_type, start, end)
+
+    columns = [price_col] + ([date_col] if date_col else [])
+    if max_rows:
+        table = dataset.head(max_rows, columns=columns, filter=expr)
+    else:
+        table = dataset.to_table(columns=columns, filter=expr)
+
+    prices = table.column(price_col)
+    if prices.type != pa.float64():
+        prices = pc.cast(prices, pa.float64())
+    prices = prices.combine_chunks().to_numpy(zero_copy_only=False)
+    if not date_col:
+        return prices, None
+
+    timestamps = _timestamps_ns(table.column(date_col).combine_chunks())
+    if np.any(timestamps[1:] < timestamps[:-1]):
+        order = np.argsort(timestamps, kind="stable")
+        prices = prices[order]
+        timestamps = timestamps[order]
+    return prices, timestamps
+
+
+def _cache_paths(path, price_col, date_col, max_rows, cache_dir):
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = json.dumps(
+        [
+            CACHE_VERSION,
+            path,
+            stat.st_size,
+            stat.st_mtime_ns,
+            price_col,
+            date_col,
+            max_rows,
+        ]
+    )
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(path), CACHE_DIRNAME)
+    stem = f"{os.path.basename(path)}.{digest}"
+    return (
+        os.path.join(cache_dir, f"{stem}.prices.npy"),
+        os.path.join(cache_dir, f"{stem}.timestamps.npy"),
+    )
+
+
+def _save_atomic(path, array):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def _load_csv_series(path, price_col, date_col, max_rows, cache, cache_dir):
+    if not cache:
+        return _parse_prices_csv(path, price_col, date_col, max_rows)
+
+    prices_path, ts_path = _cache_paths(
+        path, price_col, date_col, max_rows, cache_dir
+    )
+    if os.path.exists(prices_path):
+        prices = np.load(prices_path, mmap_mode="r")
+        timestamps = (
+            np.load(ts_path, mmap_mode="r")
+            if os.path.exists(ts_path)
+            else None
+        )
+        return prices, timestamps
+
+    prices, timestamps = _parse_prices_csv(path, price_col, date_col, max_rows)
+    try:
+        os.makedirs(os.path.dirname(prices_path), exist_ok=True)
+        # Timestamps first so a visible prices file implies a complete entry.
+        if timestamps is not None:
+            _save_atomic(ts_path, timestamps)
+        _save_atomic(prices_path, prices)
+    except OSError:
+        # Read-only data directories just skip the cache.
+        return prices, timestamps
+    return _load_csv_series(
+        path, price_col, date_col, max_rows, True, cache_dir
+    )
+
+
+def load_price_series(
+    path,
+    price_col="Close",
+    date_col=None,
+    max_rows=None,
+    cache=True,
+    cache_dir=None,
+    start=None,
+    end=None,
+):
+    """
+    Load (prices, timestamps) from a CSV, sorted by date_col when given.
+
+    With cache=True the parsed arrays are written as .npy sidecars keyed
+    by file path, size, mtime and the column options; later calls return
+    read-only memory maps without reparsing. timestamps is an int64 array
+    of epoch nanoseconds, or None without a parseable date column.
+    Parquet/Feather paths are read directly with load_columnar_prices.
+
+    start/end (inclusive) select a date range by binary search over the
+    timestamp index, so on a cached file only the probed entries and the
+    selected rows are touched.
+    """
+    if columnar_format(path):
+        return load_columnar_prices(
+            path, price_col, date_col, max_rows, start=start, end=end
+        )
+    prices, timestamps = _load_csv_series(
+        path, price_col, date_col, max_rows, cache, cache_dir
+    )
+    if start is None and end is None:
+        return prices, timestamps
+    if timestamps is None:
+        raise ValueError("Date filters need a parseable date column.")
+    rows = date_slice(timestamps, start, end)
+    return prices[rows], timestamps[rows]
+
+
+def load_prices_csv(
+    path,
+    price_col="Close",
+    date_col=None,
+    max_rows=None,
+    cache=True,
+    cache_dir=None,
+    start=None,
+    end=None,
+):
+    prices, _ = load_price_series(
+        path,
+        price_col=price_col,
+        date_col=date_col,
+        max_rows=max_rows,
+        cache=cache,
+        cache_dir=cache_dir,
+        start=start,
+        end=end,
+    )
+    return prices
+
+
+FILL_POLICIES = ("ffill", "drop")
+
+
+def _ticker_name(path):
+    name = os.path.basename(path)
+    for suffix in (".gz", ".zst", ".zstd"):
+        if name.lower().endswith(suffix):
+            name = name[: -len(suffix)]
+    return os.path.splitext(name)[0]
+
+
+def align_price_series(series, fill="ffill"):
+    """
+    Join per-asset (prices, timestamps) pairs on the union of their
+    sorted timestamps and return (price_matrix, dates).
+
+    fill="ffill" carries each asset's last price forward and drops the
+    leading dates before every asset has traded; fill="drop" keeps only
+    dates on which all assets have a price. Duplicate timestamps within
+    one asset keep the last row.
+    """
+    if fill not in FILL_POLICIES:
+        raise ValueError(f"Unknown fill policy: {fill}")
+    if not series:
+        raise ValueError("Need at least one price series.")
+
+    dates = np.unique(np.concatenate([ts for _, ts in series]))
+    matrix = np.full((len(series), len(dates)), np.nan)
+    for row, (prices, ts) in zip(matrix, series):
+        row[np.searchsorted(dates, ts)] = prices
+
+    observed = ~np.isnan(matrix)
+    if fill == "ffill":
+        # Index of the last observed date at or before each column.
+        last = np.where(observed, np.arange(len(dates)), 0)
+        np.maximum.accumulate(last, axis=1, out=last)
+        matrix = np.take_along_axis(matrix, last, axis=1)
+        keep = ~np.isnan(matrix).any(axis=0)
+    else:
+        keep = observed.all(axis=0)
+    return np.ascontiguousarray(matrix[:, keep]), dates[keep]
+
+
+def load_price_matrix(
+    paths,
+    price_col="Close",
+    date_col="Date",
+    fill="ffill",
+    max_workers=None,
+    cache=True,
+    cache_dir=None,
+):
+    """
+    Load one CSV per ticker in a thread pool and align them on date_col.
+
+    paths is a {ticker: path} mapping or a list of paths (tickers taken
+    from the file names). Returns (price_matrix, dates, tickers) with a
+    contiguous (num_assets, T) float64 matrix and int64 epoch-ns dates.
+    """
+    if isinstance(paths, dict):
+        tickers = list(paths)
+        paths = [paths[t] for t in tickers]
+    else:
+        paths = list(paths)
+        tickers = [_ticker_name(p) for p in paths]
+
+    def load(path):
+        prices, timestamps = load_price_series(
+            path,
+            price_col=price_col,
+            date_col=date_col,
+            cache=cache,
+            cache_dir=cache_dir,
+        )
+        if timestamps is None:
+            raise ValueError(
+                f"Column '{date_col}' in {path} is not ISO dates."
+            )
+        return prices, timestamps
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        series = list(pool.map(load, paths))
+    matrix, dates = align_price_series(series, fill=fill)
+    return matrix, dates, tickers
+
+
+def load_wide_price_csv(path, date_col="Date", tickers=None, fill="ffill"):
+    """
+    Price matrix from a wide CSV with one price column per ticker.
+    Empty or non-numeric cells count as missing. Returns
+    (price_matrix, dates, tickers).
+    """
+    with _open_text(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if date_col not in header:
+            raise ValueError(f"Missing column '{date_col}' in {path}")
+        date_idx = header.index(date_col)
+        if tickers is None:
+            tickers = [c for c in header if c != date_col]
+        missing = [t for t in tickers if t not in header]
+        if missing:
+            raise ValueError(f"Missing columns {missing} in {path}")
+        cols = [header.index(t) for t in tickers]
+
+        timestamps = []
+        rows = []
+        for row in reader:
+            if len(row) <= date_idx or not row[date_idx]:
+                continue
+            timestamps.append(_epoch_ns(datetime.fromisoformat(row[date_idx])))
+            values = []
+            for c in cols:
+                try:
+                    values.append(float(row[c]))
+                except (IndexError, ValueError):
+                    values.append(np.nan)
+            rows.append(values)
+
+    timestamps = np.array(timestamps, dtype=np.int64)
+    values = np.array(rows, dtype=np.float64).reshape(len(rows), len(cols))
+    series = []
+    for j in range(len(cols)):
+        present = ~np.isnan(values[:, j])
+        series.append((values[present, j], timestamps[present]))
+    matrix, dates = align_price_series(series, fill=fill)
+    return matrix, dates, list(tickers)
+
+
+def load_long_price_csv(
+    path,
+    date_col="Date",
+    ticker_col="Ticker",
+    price_col="Close",
+    tickers=None,
+    fill="ffill",
+):
+    """
+    Price matrix from a long CSV with one (date, ticker, price) row per
+    observation. Tickers come back in first-seen order unless given.
+    Returns (price_matrix, dates, tickers).
+    """
+    codes = {t: i for i, t in enumerate(tickers)} if tickers else {}
+    fixed = bool(tickers)
+    row_codes = []
+    timestamps = []
+    prices = []
+    with _open_text(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        for col in (date_col, ticker_col, price_col):
+            if col not in header:
+                raise ValueError(f"Missing column '{col}' in {path}")
+        date_idx = header.index(date_col)
+        ticker_idx = header.index(ticker_col)
+        price_idx = header.index(price_col)
+        for row in reader:
+            try:
+                price = float(row[price_idx])
+                ticker = row[ticker_idx]
+            except (IndexError, ValueError):
+                continue
+            code = codes.get(ticker)
+            if code is None:
+                if fixed:
+                    continue
+                code = codes[ticker] = len(codes)
+            row_codes.append(code)
+            timestamps.append(_epoch_ns(datetime.fromisoformat(row[date_idx])))
+            prices.append(price)
+
+    row_codes = np.array(row_codes, dtype=np.int64)
+    timestamps = np.array(timestamps, dtype=np.int64)
+    prices = np.array(prices, dtype=np.float64)
+    # Group rows by ticker, date order within each group.
+    order = np.lexsort((timestamps, row_codes))
+    bounds = np.searchsorted(row_codes[order], np.arange(len(codes) + 1))
+    series = [
+        (prices[order[lo:hi]], timestamps[order[lo:hi]])
+        for lo, hi in zip(bounds[:-1], bounds[1:])
+    ]
+    matrix, dates = align_price_series(series, fill=fill)
+    return matrix, dates, list(codes)
@@ -0,0 +1,241 @@
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # optional accelerator
+    numba = None
+
+
+NUMBA_AVAILABLE = numba is not None
+
+# Policy codes understood by the kernel.
+POLICY_ACTIONS = 0
+POLICY_RULE_BASED = 1
+POLICY_BUY_AND_HOLD = 2
+
+COMPILED_POLICIES = {
+    "rule_based": POLICY_RULE_BASED,
+    "buy_and_hold": POLICY_BUY_AND_HOLD,
+}
+
+
+def _episode_kernel(
+    prices,
+    actions,
+    policy,
+    initial_cash,
+    trade_size,
+    risk_adjusted,
+    drawdown_coeff,
+    volatility_coeff,
+    trade_penalty_coeff,
+    invalid_action_penalty,
+    inactivity_penalty,
+    values_out,
+    rewards_out,
+    actions_out,
+):
+    """
+    Scalar replica of MarketEnvironment.step run over a whole episode.
+    Returns the number of executed trades.
+    """
+    cash = initial_cash
+    holdings = 0
+    value = initial_cash
+    peak = initial_cash
+    executed = 0
+
+    for t in range(len(prices) - 1):
+        price = prices[t]
+
+        if policy == POLICY_RULE_BASED:
+            action = 0
+            if t > 0:
+                if price > prices[t - 1]:
+                    action = 1
+                elif price < prices[t - 1]:
+                    action = 2
+        elif policy == POLICY_BUY_AND_HOLD:
+            action = 1 if t == 0 else 0
+        else:
+            action = actions[t]
+        actions_out[t] = action
+
+        # Execute action
+        traded = False
+        invalid_action = False
+        if action == 1:
+            cost = price * trade_size
+            if cash >= cost:
+                cash -= cost
+                holdings += trade_size
+                traded = True
+            else:
+                invalid_action = True
+        elif action == 2:
+            if holdings >= trade_size:
+                cash += price * trade_size
+                holdings -= trade_size
+                traded = True
+            else:
+                invalid_action = True
+
+        next_price = prices[t + 1]
+        current_value = cash + holdings * next_price
+        raw_reward = current_value - value
+        value = current_value
+        peak = max(peak, current_value)
+
+        inactivity = 0.0 if traded else inactivity_penalty
+        invalid = invalid_action_penalty if invalid_action else 0.0
+        if risk_adjusted:
+            trade_penalty = trade_penalty_coeff if traded else 0.0
+            reward = (
+                raw_reward
+                - drawdown_coeff * (peak - current_value)
+                - volatility_coeff * abs(next_price - price)
+                - trade_penalty
+                - invalid
+                - inactivity
+            )
+        else:
+            reward = raw_reward - invalid - inactivity
+
+        values_out[t] = current_value
+        rewards_out[t] = reward
+        if traded:
+            executed += 1
+
+    return executed
+
+
+def _fill_kernel(
+    exec_prices,
+    actions,
+    trade_size,
+    cash,
+    holdings,
+    start,
+    quiet_steps,
+    cash_out,
+    holdings_out,
+    traded_out,
+):
+    """
+    Fill orders one step at a time from start until quiet_steps steps in
+    a row pass without a rejected buy. Returns the next step to fill and
+    the cash and holdings after the last filled one.
+    """
+    last_reject = start
+    t = start
+    while t < len(actions) and t - last_reject < quiet_steps:
+        price = exec_prices[t]
+        if actions[t] == 1:
+            cost = price * trade_size
+            if cash >= cost:
+                cash -= cost
+                holdings += trade_size
+                traded_out[t] = True
+            else:
+                last_reject = t
+        elif actions[t] == 2:
+            if holdings >= trade_size:
+                cash += price * trade_size
+                holdings -= trade_size
+                traded_out[t] = True
+        cash_out[t] = cash
+        holdings_out[t] = holdings
+        t += 1
+    return t, cash, holdings
+
+
+if NUMBA_AVAILABLE:
+    _compiled_kernel = numba.njit(cache=True)(_episode_kernel)
+    _compiled_fill = numba.njit(cache=True)(_fill_kernel)
+else:
+    _compiled_kernel = _episode_kernel
+    _compiled_fill = _fill_kernel
+
+
+def fill_binding_stretch(
+    exec_prices, actions, trade_size, cash, holdings, start, quiet_steps, out
+):
+    """
+    Stepwise order fills over a stretch where the cash constraint binds
+    (Numba-compiled when available). out is the (cash, holdings, traded)
+    arrays written in place; returns (next_step, cash, holdings).
+    """
+    cash_out, holdings_out, traded_out = out
+    t, cash, holdings = _compiled_fill(
+        exec_prices,
+        actions,
+        int(trade_size),
+        float(cash),
+        int(holdings),
+        int(start),
+        int(quiet_steps),
+        cash_out,
+        holdings_out,
+        traded_out,
+    )
+    return int(t), float(cash), int(holdings)
+
+
+def run_episode_kernel(
+    prices,
+    actions=None,
+    policy=None,
+    initial_cash=10000,
+    trade_size=1,
+    reward_mode="raw",
+    drawdown_coeff=0.01,
+    volatility_coeff=0.01,
+    trade_penalty_coeff=0.0,
+    invalid_action_penalty=0.0,
+    inactivity_penalty=0.0,
+):
+    """
+    Run one episode in a single (Numba-compiled when available) call,
+    either from a precomputed action array or a compiled policy name.
+    """
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    if len(prices) < 2:
+        raise ValueError("Need at least 2 prices for evaluation.")
+    n_steps = len(prices) - 1
+
+    if policy is not None:
+        if policy not in COMPILED_POLICIES:
+            raise ValueError(f"No compiled policy for: {policy}")
+        policy_code = COMPILED_POLICIES[policy]
+        actions = np.zeros(0, dtype=np.int8)
+    else:
+        if actions is None or len(actions) != n_steps:
+            raise ValueError("Need one action per step (len(prices) - 1).")
+        policy_code = POLICY_ACTIONS
+        actions = np.ascontiguousarray(actions, dtype=np.int8)
+
+    values = np.empty(n_steps, dtype=np.float64)
+    rewards = np.empty(n_steps, dtype=np.float64)
+    actions_out = np.empty(n_steps, dtype=np.int8)
+    executed = _compiled_kernel(
+        prices,
+        actions,
+        policy_code,
+        float(initial_cash),
+        int(trade_size),
+        reward_mode == "risk_adjusted",
+        float(drawdown_coeff),
+        float(volatility_coeff),
+        float(trade_penalty_coeff),
+        float(invalid_action_penalty),
+        float(inactivity_penalty),
+        values,
+        rewards,
+        actions_out,
+    )
+    return {
+        "values": values,
+        "rewards": rewards,
+        "actions": actions_out,
+        "executed_trades": int(executed),
+    }
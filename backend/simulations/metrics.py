@@ -1,41 +1,50 @@
 import numpy as np
 
 
+# Every metric accepts a 1-D trajectory (returns a float) or a 2-D
+# (episodes, T) matrix (returns one value per episode).
+def _as_output(result, ndim):
+    if ndim <= 1:
+        return float(result)
+    return result
+
+
 def compute_returns(values):
-    returns = []
-    for i in range(1, len(values)):
-        prev = values[i - 1]
-        if prev == 0:
-            returns.append(0.0)
-        else:
-            returns.append((values[i] - prev) / prev)
+    values = np.asarray(values, dtype=np.float64)
+    prev = values[..., :-1]
+    returns = np.zeros(prev.shape, dtype=np.float64)
+    np.divide(values[..., 1:] - prev, prev, out=returns, where=prev != 0)
     return returns
 
 
 def max_drawdown(values):
-    peak = values[0] if values else 0.0
-    max_dd = 0.0
-    for v in values:
-        peak = max(peak, v)
-        if peak > 0:
-            dd = (peak - v) / peak
-            max_dd = max(max_dd, dd)
-    return max_dd
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[-1] == 0:
+        return _as_output(np.zeros(values.shape[:-1]), values.ndim)
+    peak = np.maximum.accumulate(values, axis=-1)
+    drawdowns = np.zeros(values.shape, dtype=np.float64)
+    np.divide(peak - values, peak, out=drawdowns, where=peak > 0)
+    return _as_output(
+        np.maximum(drawdowns.max(axis=-1), 0.0), values.ndim
+    )
 
 
 def volatility(returns):
-    if not returns:
-        return 0.0
-    return float(np.std(returns))
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.shape[-1] == 0:
+        return _as_output(np.zeros(returns.shape[:-1]), returns.ndim)
+    return _as_output(np.std(returns, axis=-1), returns.ndim)
 
 
 def sharpe_ratio(returns):
-    if not returns:
-        return 0.0
-    vol = volatility(returns)
-    if vol == 0.0:
-        return 0.0
-    return float(np.mean(returns) / vol * np.sqrt(len(returns)))
+    returns = np.asarray(returns, dtype=np.float64)
+    n = returns.shape[-1]
+    if n == 0:
+        return _as_output(np.zeros(returns.shape[:-1]), returns.ndim)
+    vol = np.std(returns, axis=-1)
+    sharpe = np.zeros(vol.shape, dtype=np.float64)
+    np.divide(returns.mean(axis=-1), vol, out=sharpe, where=vol != 0.0)
+    return _as_output(sharpe * np.sqrt(n), returns.ndim)
 
 
 def turnover(executed_trades, total_steps):
@@ -44,6 +53,133 @@ def turnover(executed_trades, total_steps):
     return executed_trades / total_steps
 
 
+def action_ratios(actions, n_actions=3):
+    """
+    Fraction of steps spent on each action id: shape (n_actions,) for
+    one episode or (episodes, n_actions) for a matrix.
+    """
+    actions = np.asarray(actions, dtype=np.int64)
+    total = max(1, actions.shape[-1])
+    if actions.ndim <= 1:
+        return np.bincount(actions, minlength=n_actions)[:n_actions] / total
+    episodes = actions.shape[0]
+    offsets = np.arange(episodes)[:, None] * n_actions
+    counts = np.bincount(
+        (actions + offsets).ravel(), minlength=episodes * n_actions
+    )
+    return counts.reshape(episodes, n_actions) / total
+
+
+def _drawdowns(peaks, values):
+    out = np.zeros(np.shape(values), dtype=np.float64)
+    np.divide(peaks - values, peaks, out=out, where=peaks > 0)
+    return out
+
+
+def _sliding_max_drawdown(values, window, out, block_rows=1 << 20):
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    # Process windows in blocks so memory stays bounded for long series.
+    rows_per_block = max(1, block_rows // window)
+    for start in range(0, len(windows), rows_per_block):
+        block = windows[start:start + rows_per_block]
+        drawdowns = _drawdowns(np.maximum.accumulate(block, axis=1), block)
+        first = start + window - 1
+        out[first:first + len(block)] = np.maximum(drawdowns.max(axis=1), 0.0)
+
+
+def _rolling_max_drawdown(values, window, out):
+    """
+    Max drawdown of every `window`-long slice in O(n).
+
+    With blocks of `window` values, each slice is the tail of one block
+    plus the head of the next. For non-negative values its drawdown is
+    the largest of: the drawdown within the tail, the drawdown within
+    the head, and (max of tail - min of head) / max of tail. All three
+    come from per-block prefix/suffix running extremes, in the spirit of
+    the van Herk-Gil-Werman sliding max. Negative values break the
+    monotonicity this relies on and use the O(n * window) scan instead.
+    """
+    if np.any(values < 0):
+        _sliding_max_drawdown(values, window, out)
+        return
+
+    n = len(values)
+    pad = -n % window
+    # Padding only lands in the last block's tails, which no slice uses.
+    blocks = np.pad(values, (0, pad), mode="edge").reshape(-1, window)
+    flipped = blocks[:, ::-1]
+
+    # From each block start up to each position.
+    head_peak = np.maximum.accumulate(blocks, axis=1)
+    head_low = np.minimum.accumulate(blocks, axis=1).ravel()
+    head_dd = np.maximum.accumulate(
+        _drawdowns(head_peak, blocks), axis=1
+    ).ravel()
+
+    # From each position to its block end.
+    tail_peak = np.maximum.accumulate(flipped, axis=1)[:, ::-1].ravel()
+    tail_low = np.minimum.accumulate(flipped, axis=1)[:, ::-1]
+    tail_dd = np.maximum.accumulate(
+        _drawdowns(blocks, tail_low)[:, ::-1], axis=1
+    )[:, ::-1].ravel()
+
+    starts = np.arange(n - window + 1)
+    # Slices aligned with a block are a whole block: its tail from 0.
+    result = tail_dd[starts]
+    split = starts[starts % window != 0]
+    ends = split + window - 1
+    across = _drawdowns(tail_peak[split], head_low[ends])
+    result[split] = np.maximum.reduce(
+        [tail_dd[split], head_dd[ends], across]
+    )
+    out[window - 1:] = np.maximum(result, 0.0)
+
+
+def rolling_metrics(values, window):
+    """
+    Rolling volatility, Sharpe and max drawdown over the last `window`
+    portfolio values (window - 1 returns). Arrays are aligned with
+    `values`; the first window - 1 entries are NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    window = int(window)
+    if window < 2:
+        raise ValueError("Rolling window must be at least 2.")
+    n = len(values)
+    out = {
+        "rolling_volatility": np.full(n, np.nan),
+        "rolling_sharpe": np.full(n, np.nan),
+        "rolling_max_drawdown": np.full(n, np.nan),
+    }
+    if n < window:
+        return out
+
+    returns = compute_returns(values)
+    # Centering first keeps the sum-of-squares difference well conditioned.
+    centered = returns - returns.mean()
+    sums = np.concatenate(([0.0], np.cumsum(centered)))
+    sq_sums = np.concatenate(([0.0], np.cumsum(centered * centered)))
+
+    m = window - 1
+    ends = np.arange(window - 1, n)
+    window_sum = sums[ends] - sums[ends - m]
+    window_sq = sq_sums[ends] - sq_sums[ends - m]
+    centered_mean = window_sum / m
+    var = window_sq / m - centered_mean * centered_mean
+    # Differences of running sums carry rounding noise; treat variance
+    # at that level as zero, like a constant window.
+    var[var <= np.finfo(np.float64).eps * 16 * sq_sums[-1] / m] = 0.0
+    vol = np.sqrt(var)
+    mean = centered_mean + returns.mean()
+
+    sharpe = np.zeros(len(ends), dtype=np.float64)
+    np.divide(mean, vol, out=sharpe, where=vol > 0)
+    out["rolling_volatility"][window - 1:] = vol
+    out["rolling_sharpe"][window - 1:] = sharpe * np.sqrt(m)
+    _rolling_max_drawdown(values, window, out["rolling_max_drawdown"])
+    return out
+
+
 METRICS = [
     "final_value",
     "total_reward",
@@ -57,12 +57,19 @@ def to_float(value):
         return math.nan
 
 
-def format_value(mean, std):
+def format_value(
+    mean, std, ci_low=math.nan, ci_high=math.nan, p_value=math.nan
+):
     if math.isnan(mean):
         return "NA"
     if math.isnan(std):
         std = 0.0
-    return f"{mean:.3f} ± {std:.3f}"
+    text = f"{mean:.3f} ± {std:.3f}"
+    if not (math.isnan(ci_low) or math.isnan(ci_high)):
+        text += f" [{ci_low:.3f}, {ci_high:.3f}]"
+    if not math.isnan(p_value):
+        text += f" (p={p_value:.3f})"
+    return text
 
 
 def build_table(rows, metrics):
@@ -85,7 +92,15 @@ def build_table(rows, metrics):
             for metric in metrics:
                 mean = to_float(row.get(f"{metric}_mean"))
                 std = to_float(row.get(f"{metric}_std"))
-                cells.append(format_value(mean, std))
+                cells.append(
+                    format_value(
+                        mean,
+                        std,
+                        to_float(row.get(f"{metric}_ci_low")),
+                        to_float(row.get(f"{metric}_ci_high")),
+                        to_float(row.get(f"{metric}_p_value")),
+                    )
+                )
             lines.append("| " + " | ".join(cells) + " |")
     return "\n".join(lines)
 
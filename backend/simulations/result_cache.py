@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import weakref
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+from experiments.scenario_registry import scenario_key
+
+
+# Bump when the key layout or blob format changes.
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 1 << 30
+
+# Environment variables read by cache_from_env (used by the API).
+CACHE_DIR_ENV = "PROSPERITY_RESULT_CACHE"
+CACHE_MAX_BYTES_ENV = "PROSPERITY_RESULT_CACHE_BYTES"
+
+# Packages whose source determines simulation results.
+_CODE_DIRS = ("backend/agents", "backend/env", "backend/simulations")
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+_CODE_VERSION = None
+
+# Digests of recently hashed read-only price arrays by id, least recently
+# used first. Entries hold a weak reference so a reused id is detected
+# without keeping the array alive.
+_DIGESTS = OrderedDict()
+MAX_DIGESTS = 128
+
+
+def code_version():
+    """
+    Hash of the agent, env and simulation sources, computed once per
+    process. Editing any of them invalidates every cached result.
+    """
+    global _CODE_VERSION
+    if _CODE_VERSION is None:
+        digest = hashlib.sha1()
+        for rel in _CODE_DIRS:
+            base = os.path.join(_ROOT, rel)
+            for dirpath, dirnames, filenames in os.walk(base):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    if not name.endswith(".py"):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    rel_path = os.path.relpath(path, _ROOT)
+                    digest.update(rel_path.encode("utf-8"))
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+        _CODE_VERSION = digest.hexdigest()
+    return _CODE_VERSION
+
+
+def price_digest(prices):
+    """
+    Content hash of a price array (float64 values and shape). Digests of
+    the last MAX_DIGESTS read-only arrays, such as registry or
+    memory-mapped series, are remembered so repeated lookups skip the
+    hashing.
+    """
+    frozen = isinstance(prices, np.ndarray) and not prices.flags.writeable
+    if frozen:
+        entry = _DIGESTS.get(id(prices))
+        if entry is not None and entry[0]() is prices:
+            _DIGESTS.move_to_end(id(prices))
+            return entry[1]
+    values = np.ascontiguousarray(prices, dtype=np.float64)
+    digest = hashlib.sha1(repr(values.shape).encode("utf-8"))
+    digest.update(values.data)
+    digest = digest.hexdigest()
+    if frozen:
+        _DIGESTS[id(prices)] = (weakref.ref(prices), digest)
+        _DIGESTS.move_to_end(id(prices))
+        if len(_DIGESTS) > MAX_DIGESTS:
+            _DIGESTS.popitem(last=False)
+    return digest
+
+
+def result_key(kind, prices, params, seed=None):
+    """
+    Stable cache key for a run of `kind` (e.g. "experiment", "ppo") on
+    prices (an array or a tuple of arrays) with result-affecting params
+    (agent type included) and seed, under the current code version.
+    """
+    if isinstance(prices, tuple):
+        digests = [price_digest(p) for p in prices]
+    else:
+        digests = price_digest(prices)
+    name, params, seed = scenario_key(kind, params, seed)
+    blob = json.dumps(
+        [CACHE_VERSION, code_version(), digests, name, params, seed]
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of JSON-serializable results.
+
+    An SQLite index (index.sqlite) records the size and last use of each
+    entry; values live in zlib-compressed JSON blobs under blobs/. Once
+    the blobs exceed max_bytes, the least recently used entries are
+    evicted. Safe to share between processes.
+    """
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = os.path.abspath(root)
+        self.max_bytes = int(max_bytes)
+        os.makedirs(os.path.join(self.root, "blobs"), exist_ok=True)
+        with self._index() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, "
+                "size INTEGER NOT NULL, "
+                "created REAL NOT NULL, "
+                "last_used REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_last_used "
+                "ON entries (last_used)"
+            )
+
+    @contextmanager
+    def _index(self):
+        conn = sqlite3.connect(
+            os.path.join(self.root, "index.sqlite"), timeout=30
+        )
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _blob_path(self, key):
+        return os.path.join(self.root, "blobs", key[:2], f"{key}.json.z")
+
+    def get(self, key):
+        """
+        Cached value for key, or None on a miss.
+        """
+        with self._index() as conn:
+            found = conn.execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?",
+                (time.time(), key),
+            ).rowcount
+        if not found:
+            return None
+        try:
+            with open(self._blob_path(key), "rb") as f:
+                return json.loads(zlib.decompress(f.read()))
+        except (OSError, zlib.error, ValueError):
+            # Missing or truncated blob: forget the entry.
+            self.discard(key)
+            return None
+
+    def put(self, key, value):
+        data = zlib.compress(json.dumps(value).encode("utf-8"))
+        path = self._blob_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        with self._index() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                (key, len(data), now, now),
+            )
+            evicted = self._evict(conn)
+        for old in evicted:
+            self._remove_blob(old)
+
+    def discard(self, key):
+        with self._index() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._remove_blob(key)
+
+    def _evict(self, conn):
+        total = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+        evicted = []
+        if total <= self.max_bytes:
+            return evicted
+        rows = conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_used"
+        )
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append(key)
+            total -= size
+        conn.executemany(
+            "DELETE FROM entries WHERE key = ?", [(k,) for k in evicted]
+        )
+        return evicted
+
+    def _remove_blob(self, key):
+        try:
+            os.remove(self._blob_path(key))
+        except FileNotFoundError:
+            pass
+
+    def total_bytes(self):
+        with self._index() as conn:
+            return conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+
+    def __len__(self):
+        with self._index() as conn:
+            return conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def cache_from_env():
+    """
+    ResultCache in $PROSPERITY_RESULT_CACHE (bounded by
+    $PROSPERITY_RESULT_CACHE_BYTES), or None when it is unset.
+    """
+    root = os.environ.get(CACHE_DIR_ENV)
+    if not root:
+        return None
+    max_bytes = int(os.environ.get(CACHE_MAX_BYTES_ENV, DEFAULT_MAX_BYTES))
+    return ResultCache(root, max_bytes=max_bytes)
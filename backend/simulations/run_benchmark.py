@@ -1,14 +1,34 @@
 import argparse
 import csv
+import hashlib
+import json
 import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import ExitStack
 
-from backend.simulations.data_loader import load_prices_csv
+import numpy as np
+
+from backend.simulations.bars import aggregate_bars
+from backend.simulations.data_loader import (
+    iter_price_windows,
+    load_price_series,
+    to_epoch_ns,
+)
+from backend.simulations.result_cache import ResultCache
 from backend.simulations.run_simulation import (
     run_experiment,
     run_ppo_episode,
     run_ppo_train_eval,
 )
-from experiments.market_scenarios import SCENARIOS, regime_schedule
+from experiments.market_scenarios import SCENARIOS
+from experiments.scenario_registry import (
+    attach,
+    cached_series,
+    get_scenario,
+    get_schedule,
+    scenario_key,
+    shared_prices,
+)
 
 
 DEFAULT_SCENARIOS = [
@@ -121,6 +141,40 @@ def parse_args():
         default=1,
         help="Units per trade (increases action impact).",
     )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        default="step",
+        choices=["step", "vectorized", "numba", "batched"],
+        help="Episode engine for non-PPO agents.",
+    )
+    parser.add_argument(
+        "--n-jobs",
+        type=int,
+        default=1,
+        help="Worker processes for non-PPO episodes.",
+    )
+    parser.add_argument(
+        "--n-envs",
+        type=int,
+        default=1,
+        help="Parallel env copies per PPO training run.",
+    )
+    parser.add_argument(
+        "--n-workers",
+        type=int,
+        default=0,
+        help="Subprocess workers for PPO env stepping (0/1 = in-process).",
+    )
+    parser.add_argument(
+        "--torch-threads",
+        type=int,
+        default=0,
+        help=(
+            "Cap torch intra-op threads for PPO (0 = the cores left by "
+            "--n-workers, or the torch default without workers)."
+        ),
+    )
     parser.add_argument(
         "--ppo-progress",
         action="store_true",
@@ -136,7 +190,8 @@ def parse_args():
         "--prices-csv",
         type=str,
         default="",
-        help="CSV file with historical prices (overrides scenarios).",
+        help="Historical prices: CSV (.gz/.zst) or Parquet/Feather "
+        "(overrides scenarios).",
     )
     parser.add_argument(
         "--price-col",
@@ -162,12 +217,87 @@ def parse_args():
         default=0,
         help="Optional max rows to load from CSV (0 = all).",
     )
+    parser.add_argument(
+        "--start",
+        type=str,
+        default="",
+        help="First date to load from the prices file (ISO, inclusive).",
+    )
+    parser.add_argument(
+        "--end",
+        type=str,
+        default="",
+        help="Last date to load from the prices file (ISO, inclusive).",
+    )
+    parser.add_argument(
+        "--split-date",
+        type=str,
+        default="",
+        help="Train on dates before this, evaluate from it (overrides "
+        "--train-ratio).",
+    )
+    parser.add_argument(
+        "--bar-freq",
+        type=str,
+        default="",
+        help="Aggregate ticks into bars (e.g. 1s, 1m, 1h, 1d) and trade "
+        "on bar closes.",
+    )
+    parser.add_argument(
+        "--window-size",
+        type=int,
+        default=0,
+        help="Stream the prices CSV as episodes of this many rows (0 = off).",
+    )
+    parser.add_argument(
+        "--window-overlap",
+        type=int,
+        default=0,
+        help="Rows shared by consecutive windows (warm-up overlap).",
+    )
+    parser.add_argument(
+        "--no-price-cache",
+        action="store_true",
+        help="Reparse the prices CSV instead of using the .npy cache.",
+    )
+    parser.add_argument(
+        "--price-cache-dir",
+        type=str,
+        default="",
+        help="Directory for the prices cache (default: next to the CSV).",
+    )
     parser.add_argument(
         "--out",
         type=str,
         default="experiments/results/benchmark_results.csv",
         help="Output CSV path.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes running grid cells in parallel.",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Start over instead of skipping cells completed by a "
+        "previous run with the same settings.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="",
+        help="Result cache directory; runs with identical prices and "
+        "settings are reused across sweeps.",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=1024,
+        help="Size bound of the result cache (least recently used "
+        "results are evicted).",
+    )
     return parser.parse_args()
 
 
@@ -179,15 +309,282 @@ def ensure_parent_dir(path):
 
 def scenario_prices(scenario, schedule, schedule_length):
     if schedule:
-        return regime_schedule(schedule, length=schedule_length), "custom"
+        return get_schedule(schedule, length=schedule_length), "custom"
+    # Multi-asset scenarios are registered too, but these runners drive
+    # the single-asset environment.
     if scenario not in SCENARIOS:
         raise ValueError(f"Unknown market scenario: {scenario}")
-    return SCENARIOS[scenario](), scenario
+    return get_scenario(scenario), scenario
 
 
-def write_row(writer, base, metrics):
-    row = {**base, **metrics}
-    writer.writerow(row)
+def split_train_eval(prices, train_ratio):
+    if len(prices) < 2:
+        raise ValueError("Need at least 2 prices for evaluation.")
+    if 0 < train_ratio < 1:
+        split_idx = max(2, int(len(prices) * train_ratio))
+        split_idx = min(split_idx, len(prices) - 2)
+        return prices[:split_idx], prices[split_idx:]
+    return prices, prices
+
+
+def split_by_date(prices, timestamps, split_date):
+    if timestamps is None:
+        raise ValueError("--split-date needs a parseable --date-col.")
+    split_idx = int(np.searchsorted(timestamps, to_epoch_ns(split_date)))
+    if split_idx < 2 or len(prices) - split_idx < 2:
+        raise ValueError(
+            f"--split-date {split_date} leaves fewer than 2 prices on a side."
+        )
+    return prices[:split_idx], prices[split_idx:]
+
+
+def csv_price_groups(args):
+    """
+    (label, train_prices, eval_prices) for the prices file: the whole
+    file, or one group per streamed window when --window-size is set.
+    """
+    max_rows = args.max_rows or None
+    date_col = args.date_col.strip() or None
+    start = args.start or None
+    end = args.end or None
+    label = os.path.splitext(os.path.basename(args.prices_csv))[0]
+    if args.window_size:
+        if args.split_date or args.bar_freq:
+            raise ValueError(
+                "--split-date and --bar-freq do not apply to windowed runs."
+            )
+        windows = iter_price_windows(
+            args.prices_csv,
+            args.window_size,
+            overlap=args.window_overlap,
+            price_col=args.price_col,
+            date_col=date_col,
+            max_rows=max_rows,
+            start=start,
+            end=end,
+        )
+        for k, window in enumerate(windows):
+            train_prices, eval_prices = split_train_eval(
+                window, args.train_ratio
+            )
+            yield f"real_{label}_w{k}", train_prices, eval_prices
+        return
+
+    # Loaded once per process and shared read-only by every task.
+    load_options = {
+        "path": os.path.abspath(args.prices_csv),
+        "price_col": args.price_col,
+        "date_col": date_col,
+        "max_rows": max_rows,
+        "start": start,
+        "end": end,
+    }
+    prices, timestamps = cached_series(
+        scenario_key("file", load_options),
+        lambda: load_price_series(
+            args.prices_csv,
+            price_col=args.price_col,
+            date_col=date_col,
+            max_rows=max_rows,
+            cache=not args.no_price_cache,
+            cache_dir=args.price_cache_dir or None,
+            start=start,
+            end=end,
+        ),
+    )
+    if args.bar_freq:
+        if timestamps is None:
+            raise ValueError("--bar-freq needs a parseable --date-col.")
+        bars = aggregate_bars(timestamps, prices, args.bar_freq)
+        prices, timestamps = bars["close"], bars["timestamps"]
+    if args.split_date:
+        train_prices, eval_prices = split_by_date(
+            prices, timestamps, args.split_date
+        )
+    else:
+        train_prices, eval_prices = split_train_eval(
+            prices, args.train_ratio
+        )
+    yield f"real_{label}", train_prices, eval_prices
+
+
+RESULT_FIELDS = [
+    "scenario",
+    "reward_mode",
+    "agent",
+    "run_id",
+    "final_value",
+    "total_reward",
+    "max_drawdown",
+    "volatility",
+    "sharpe",
+    "turnover",
+    "action_hold_ratio",
+    "action_buy_ratio",
+    "action_sell_ratio",
+    "executed_trade_ratio",
+]
+
+# Flags that change how a sweep runs but not its results; they are left
+# out of the resume fingerprint.
+EXECUTION_FLAGS = {
+    "out",
+    "workers",
+    "n_jobs",
+    "torch_threads",
+    "ppo_progress",
+    "ppo_log_every",
+    "no_resume",
+    "no_price_cache",
+    "price_cache_dir",
+    "cache_dir",
+    "cache_max_mb",
+}
+
+
+def task_id(scenario, reward_mode, agent, repeat=None):
+    """
+    Stable id of one grid cell: a PPO repeat, or all episodes of a
+    baseline agent.
+    """
+    repeat = "*" if repeat is None else repeat
+    return f"{scenario}|{reward_mode}|{agent}|{repeat}"
+
+
+def row_task_id(row):
+    repeat = row["run_id"] if row["agent"] == "ppo" else None
+    return task_id(row["scenario"], row["reward_mode"], row["agent"], repeat)
+
+
+def expand_tasks(scenario_labels, reward_modes, agents, ppo_repeats):
+    tasks = []
+    for label in scenario_labels:
+        for reward_mode in reward_modes:
+            for agent in agents:
+                repeats = range(ppo_repeats) if agent == "ppo" else [None]
+                for repeat in repeats:
+                    tasks.append({
+                        "id": task_id(label, reward_mode, agent, repeat),
+                        "scenario": label,
+                        "reward_mode": reward_mode,
+                        "agent": agent,
+                        "repeat": repeat,
+                    })
+    return tasks
+
+
+def sweep_fingerprint(args):
+    settings = {
+        k: v for k, v in sorted(vars(args).items())
+        if k not in EXECUTION_FLAGS
+    }
+    if args.prices_csv:
+        stat = os.stat(args.prices_csv)
+        settings["prices_file"] = [stat.st_size, stat.st_mtime_ns]
+    blob = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def run_task(task, train_prices, eval_prices, same_prices, settings):
+    """
+    Run one grid cell and return its CSV rows. Prices may be
+    shared-memory handles when running in a pool worker.
+    """
+    train_prices = attach(train_prices)
+    eval_prices = attach(eval_prices)
+    cache = None
+    if settings["cache_dir"]:
+        cache = ResultCache(
+            settings["cache_dir"],
+            max_bytes=settings["cache_max_mb"] << 20,
+        )
+    reward_mode = task["reward_mode"]
+    agent = task["agent"]
+    base = {
+        "scenario": task["scenario"],
+        "reward_mode": reward_mode,
+        "agent": agent,
+    }
+    common = dict(
+        reward_mode=reward_mode,
+        drawdown_coeff=settings["drawdown_coeff"],
+        volatility_coeff=settings["volatility_coeff"],
+        trade_penalty_coeff=settings["trade_penalty_coeff"],
+        invalid_action_penalty=settings["invalid_action_penalty"],
+        inactivity_penalty=settings["inactivity_penalty"],
+        trade_size=settings["trade_size"],
+        keep_trajectory=False,
+        cache=cache,
+    )
+
+    if agent == "ppo":
+        i = task["repeat"]
+        ppo_kwargs = dict(
+            timesteps=settings["timesteps"],
+            entropy_coef=settings["entropy_coef"],
+            n_envs=settings["n_envs"],
+            n_workers=settings["n_workers"],
+            torch_threads=settings["torch_threads"] or None,
+            progress=settings["ppo_progress"],
+            log_every=settings["ppo_log_every"],
+            progress_label=(
+                f"PPO {reward_mode} {i+1}/{settings['ppo_repeats']}"
+            ),
+            **common,
+        )
+        if same_prices:
+            result = run_ppo_episode(train_prices, **ppo_kwargs)
+        else:
+            result = run_ppo_train_eval(
+                train_prices, eval_prices, **ppo_kwargs
+            )
+        return [{**base, "run_id": i, **result["metrics"]}]
+
+    result = run_experiment(
+        eval_prices,
+        agent_type=agent,
+        n_episodes=settings["episodes"],
+        seed_start=settings["seed_start"],
+        engine=settings["engine"],
+        n_jobs=settings["n_jobs"],
+        **common,
+    )
+    return [
+        {**base, "run_id": i, **episode["metrics"]}
+        for i, episode in enumerate(result["episodes"])
+    ]
+
+
+def open_sweep(out_path, fingerprint, resume):
+    """
+    Prepare the output CSV and its manifest for a sweep.
+
+    The manifest (out_path + ".manifest") holds the sweep fingerprint and
+    one line per completed task. When resuming a sweep with the same
+    fingerprint, rows of tasks that never completed are dropped and the
+    completed task ids are returned; otherwise both files start fresh.
+    """
+    manifest_path = out_path + ".manifest"
+    done = set()
+    if resume and os.path.exists(manifest_path) and os.path.exists(out_path):
+        with open(manifest_path, "r") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        if entries and entries[0].get("fingerprint") == fingerprint:
+            done = {e["task"] for e in entries[1:] if "task" in e}
+
+    if done:
+        with open(out_path, "r", newline="") as f:
+            rows = [r for r in csv.DictReader(f) if row_task_id(r) in done]
+        with open(out_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(out_path, "w", newline="") as f:
+            csv.DictWriter(f, fieldnames=RESULT_FIELDS).writeheader()
+        with open(manifest_path, "w") as f:
+            f.write(json.dumps({"fingerprint": fingerprint}) + "\n")
+    return manifest_path, done
 
 
 def run_benchmark():
@@ -203,126 +600,105 @@ def run_benchmark():
     out_path = args.out
     ensure_parent_dir(out_path)
 
-    scenario_groups = []
+    # Groups are produced lazily so streamed windows are never all held
+    # (or published to shared memory) at once.
     if args.prices_csv:
-        max_rows = args.max_rows or None
-        date_col = args.date_col.strip() or None
-        prices = load_prices_csv(
-            args.prices_csv,
-            price_col=args.price_col,
-            date_col=date_col,
-            max_rows=max_rows,
+        scenario_groups = csv_price_groups(args)
+    else:
+        scenario_groups = (
+            (label, prices, prices)
+            for prices, label in (
+                scenario_prices(scenario, schedule, args.schedule_length)
+                for scenario in scenarios
+            )
         )
-        if len(prices) < 2:
-            raise ValueError("Need at least 2 prices for evaluation.")
-        train_ratio = args.train_ratio
-        if 0 < train_ratio < 1:
-            split_idx = max(2, int(len(prices) * train_ratio))
-            split_idx = min(split_idx, len(prices) - 2)
-            train_prices = prices[:split_idx]
-            eval_prices = prices[split_idx:]
+
+    manifest_path, done = open_sweep(
+        out_path, sweep_fingerprint(args), resume=not args.no_resume
+    )
+    if done:
+        print(f"Resuming: {len(done)} tasks already complete.")
+    settings = vars(args)
+
+    def group_tasks():
+        seen = set()
+        for label, train_prices, eval_prices in scenario_groups:
+            if label in seen:
+                continue
+            seen.add(label)
+            tasks = expand_tasks(
+                [label], reward_modes, agents, args.ppo_repeats
+            )
+            pending = [t for t in tasks if t["id"] not in done]
+            if pending:
+                yield pending, train_prices, eval_prices
+
+    with open(out_path, "a", newline="") as f, open(
+        manifest_path, "a"
+    ) as manifest, ExitStack() as stack:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+
+        def record(task, rows):
+            # Rows first, then the manifest entry, so a crash in between
+            # only costs a rerun of this task.
+            writer.writerows(rows)
+            f.flush()
+            manifest.write(json.dumps({"task": task["id"]}) + "\n")
+            manifest.flush()
+
+        if args.workers <= 1:
+            for pending, train_prices, eval_prices in group_tasks():
+                same = train_prices is eval_prices
+                for task in pending:
+                    record(
+                        task,
+                        run_task(
+                            task, train_prices, eval_prices, same, settings
+                        ),
+                    )
         else:
-            train_prices = prices
-            eval_prices = prices
-        label = os.path.splitext(os.path.basename(args.prices_csv))[0]
-        scenario_groups.append((f"real_{label}", train_prices, eval_prices))
-    else:
-        for scenario in scenarios:
-            prices, scenario_label = scenario_prices(
-                scenario, schedule, args.schedule_length
+            # Workers attach to shared-memory copies of each group's
+            # prices. At most `workers` groups are published at a time;
+            # a group's blocks are released once its last task finishes.
+            published = {}
+            in_flight = {}
+            stack.callback(
+                lambda: [group.close() for group, _ in published.values()]
+            )
+            pool = stack.enter_context(
+                ProcessPoolExecutor(max_workers=args.workers)
             )
-            scenario_groups.append((scenario_label, prices, prices))
-
-    fieldnames = [
-        "scenario",
-        "reward_mode",
-        "agent",
-        "run_id",
-        "final_value",
-        "total_reward",
-        "max_drawdown",
-        "volatility",
-        "sharpe",
-        "turnover",
-        "action_hold_ratio",
-        "action_buy_ratio",
-        "action_sell_ratio",
-        "executed_trade_ratio",
-    ]
 
-    with open(out_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for scenario_label, train_prices, eval_prices in scenario_groups:
-            for reward_mode in reward_modes:
-                for agent in agents:
-                    if agent == "ppo":
-                        for i in range(args.ppo_repeats):
-                            if train_prices is eval_prices:
-                                result = run_ppo_episode(
-                                    train_prices,
-                                    timesteps=args.timesteps,
-                                    reward_mode=reward_mode,
-                                    drawdown_coeff=args.drawdown_coeff,
-                                    volatility_coeff=args.volatility_coeff,
-                                    trade_penalty_coeff=args.trade_penalty_coeff,
-                                    invalid_action_penalty=args.invalid_action_penalty,
-                                    inactivity_penalty=args.inactivity_penalty,
-                                    entropy_coef=args.entropy_coef,
-                                    trade_size=args.trade_size,
-                                    progress=args.ppo_progress,
-                                    log_every=args.ppo_log_every,
-                                    progress_label=f"PPO {reward_mode} {i+1}/{args.ppo_repeats}",
-                                )
-                            else:
-                                result = run_ppo_train_eval(
-                                    train_prices,
-                                    eval_prices,
-                                    timesteps=args.timesteps,
-                                    reward_mode=reward_mode,
-                                    drawdown_coeff=args.drawdown_coeff,
-                                    volatility_coeff=args.volatility_coeff,
-                                    trade_penalty_coeff=args.trade_penalty_coeff,
-                                    invalid_action_penalty=args.invalid_action_penalty,
-                                    inactivity_penalty=args.inactivity_penalty,
-                                    entropy_coef=args.entropy_coef,
-                                    trade_size=args.trade_size,
-                                    progress=args.ppo_progress,
-                                    log_every=args.ppo_log_every,
-                                    progress_label=f"PPO {reward_mode} {i+1}/{args.ppo_repeats}",
-                                )
-                            metrics = result["metrics"]
-                            base = {
-                                "scenario": scenario_label,
-                                "reward_mode": reward_mode,
-                                "agent": agent,
-                                "run_id": i,
-                            }
-                            write_row(writer, base, metrics)
+            def finish(futures):
+                for future in futures:
+                    task, group_id = in_flight.pop(future)
+                    record(task, future.result())
+                    group, remaining = published[group_id]
+                    if remaining == 1:
+                        del published[group_id]
+                        group.close()
                     else:
-                        result = run_experiment(
-                            eval_prices,
-                            agent_type=agent,
-                            n_episodes=args.episodes,
-                            seed_start=args.seed_start,
-                            reward_mode=reward_mode,
-                            drawdown_coeff=args.drawdown_coeff,
-                            volatility_coeff=args.volatility_coeff,
-                            trade_penalty_coeff=args.trade_penalty_coeff,
-                            invalid_action_penalty=args.invalid_action_penalty,
-                            inactivity_penalty=args.inactivity_penalty,
-                            trade_size=args.trade_size,
-                        )
-                        for i, episode in enumerate(result["episodes"]):
-                            metrics = episode["metrics"]
-                            base = {
-                                "scenario": scenario_label,
-                                "reward_mode": reward_mode,
-                                "agent": agent,
-                                "run_id": i,
-                            }
-                            write_row(writer, base, metrics)
+                        published[group_id] = (group, remaining - 1)
+
+            for group_id, (pending, train_prices, eval_prices) in enumerate(
+                group_tasks()
+            ):
+                while len(published) >= args.workers:
+                    finish(wait(in_flight, return_when=FIRST_COMPLETED)[0])
+                group = ExitStack()
+                handles = [
+                    group.enter_context(shared_prices(p))
+                    for p in (train_prices, eval_prices)
+                ]
+                published[group_id] = (group, len(pending))
+                same = train_prices is eval_prices
+                for task in pending:
+                    future = pool.submit(
+                        run_task, task, *handles, same, settings
+                    )
+                    in_flight[future] = (task, group_id)
+            while in_flight:
+                finish(wait(in_flight, return_when=FIRST_COMPLETED)[0])
 
     print(f"Wrote benchmark results to {out_path}")
 
@@ -3,7 +3,8 @@ import csv
 import os
 
 from backend.simulations.run_simulation import run_ppo_episode
-from experiments.market_scenarios import SCENARIOS, regime_schedule
+from experiments.market_scenarios import SCENARIOS
+from experiments.scenario_registry import get_scenario, get_schedule
 
 
 def parse_args():
@@ -110,10 +111,12 @@ def ensure_parent_dir(path):
 
 def scenario_prices(scenario, schedule, schedule_length):
     if schedule:
-        return regime_schedule(schedule, length=schedule_length), "custom"
+        return get_schedule(schedule, length=schedule_length), "custom"
+    # Multi-asset scenarios are registered too, but these runners drive
+    # the single-asset environment.
     if scenario not in SCENARIOS:
         raise ValueError(f"Unknown market scenario: {scenario}")
-    return SCENARIOS[scenario](), scenario
+    return get_scenario(scenario), scenario
 
 
 def main():
@@ -162,6 +165,7 @@ def main():
                     progress=args.progress,
                     log_every=args.log_every,
                     progress_label=label,
+                    keep_trajectory=False,
                 )
                 metrics = result["metrics"]
                 writer.writerow(
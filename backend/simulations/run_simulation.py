@@ -1,22 +1,51 @@
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 
+from backend.env.batched_env import BatchedMarketEnvironment
 from backend.env.market_env import MarketEnvironment
+from backend.env.multi_asset_env import MultiAssetMarketEnvironment
 from backend.agents.buy_and_hold_agent import BuyAndHoldAgent
 from backend.agents.random_agent import RandomAgent
 from backend.agents.rule_based_agent import RuleBasedAgent
-from backend.agents.ppo_agent import train_ppo
-from backend.env.rl_env import RLMarketEnv
-from experiments.market_scenarios import SCENARIOS, regime_schedule
+from backend.agents.ppo_agent import PPO_SEED, train_ppo
+from backend.env.rl_env import RLMarketEnv, RLMultiAssetEnv
+from backend.simulations.backtest import backtest, policy_actions
+from backend.simulations.bootstrap import bootstrap_ci
+from backend.simulations.jit_kernel import (
+    COMPILED_POLICIES,
+    NUMBA_AVAILABLE,
+    run_episode_kernel,
+)
+from experiments.market_scenarios import (
+    MULTI_ASSET_SCENARIOS,
+    multi_asset_prices,
+)
 from experiments.experiment_config import ExperimentConfig
-from backend.simulations.metrics import (
-    compute_returns,
-    max_drawdown,
-    volatility,
-    sharpe_ratio,
-    turnover,
+from experiments.scenario_registry import (
+    attach,
+    cached_series,
+    get_scenario,
+    get_schedule,
+    scenario_key,
+    shared_prices,
+)
+from backend.simulations.metrics import rolling_metrics
+from backend.simulations.result_cache import result_key
+from backend.simulations.trajectory import (
+    OnlineMetrics,
+    TrajectoryRecorder,
+    batch_metrics,
 )
 
 
+# Resamples for the confidence intervals in run_experiment summaries.
+SUMMARY_RESAMPLES = 2000
+
+# Portfolio values held per batch by run_batched_episodes (32 MiB).
+BATCH_CELLS = 1 << 22
+
+
 # JSON-safe serializer (CRITICAL)
 def make_json_serializable(obj):
     if isinstance(obj, dict):
@@ -28,6 +57,51 @@ def make_json_serializable(obj):
     return obj
 
 
+def nan_to_none(values):
+    return [None if np.isnan(v) else v for v in values.tolist()]
+
+
+def episode_result(
+    recorder,
+    total_reward,
+    executed_trades,
+    keep_trajectory=True,
+    rolling_window=None,
+):
+    """
+    Metrics plus, unless keep_trajectory is False, the per-step
+    portfolio values and actions. rolling_window adds rolling
+    volatility/Sharpe/drawdown series aligned with the trajectory
+    (None where the window is not yet full).
+    """
+    result = {
+        "metrics": recorder.metrics(total_reward, executed_trades),
+        "trajectory": [],
+        "actions": [],
+    }
+    if keep_trajectory:
+        result.update(
+            trajectory_fields(
+                recorder.values, recorder.actions, rolling_window
+            )
+        )
+    return make_json_serializable(result)
+
+
+def trajectory_fields(values, actions, rolling_window=None):
+    """
+    JSON-ready "trajectory", "actions" and (with rolling_window)
+    "rolling" entries of an episode result.
+    """
+    fields = {"trajectory": values.tolist(), "actions": actions.tolist()}
+    if rolling_window:
+        rolling = rolling_metrics(values, rolling_window)
+        fields["rolling"] = {
+            name: nan_to_none(series) for name, series in rolling.items()
+        }
+    return fields
+
+
 # Single episode (random / rule)
 def run_episode(
     prices,
@@ -40,65 +114,127 @@ def run_episode(
     invalid_action_penalty=0.0,
     inactivity_penalty=0.0,
     trade_size=1,
+    engine="step",
+    keep_trajectory=True,
+    rolling_window=None,
 ):
-    env = MarketEnvironment(
-        prices,
-        reward_mode=reward_mode,
-        drawdown_coeff=drawdown_coeff,
-        volatility_coeff=volatility_coeff,
-        trade_penalty_coeff=trade_penalty_coeff,
-        invalid_action_penalty=invalid_action_penalty,
-        inactivity_penalty=inactivity_penalty,
-        trade_size=trade_size,
-    )
+    """
+    engine="step" drives MarketEnvironment one call at a time;
+    engine="vectorized" replays the agent's action array through the
+    NumPy backtest kernel; engine="numba" runs the whole episode in the
+    compiled kernel and falls back to "step" when Numba is missing;
+    engine="batched" steps BatchedMarketEnvironment (see
+    run_batched_episodes, which run_experiment uses for whole chunks).
+    All engines give the same metrics. With keep_trajectory=False the
+    step engine streams metrics in constant memory and the result has
+    empty "trajectory"/"actions" lists.
+    """
+    if engine == "batched":
+        return run_batched_episodes(
+            prices,
+            [seed],
+            agent_type=agent_type,
+            reward_mode=reward_mode,
+            drawdown_coeff=drawdown_coeff,
+            volatility_coeff=volatility_coeff,
+            trade_penalty_coeff=trade_penalty_coeff,
+            invalid_action_penalty=invalid_action_penalty,
+            inactivity_penalty=inactivity_penalty,
+            trade_size=trade_size,
+            keep_trajectory=keep_trajectory,
+            rolling_window=rolling_window,
+        )[0]
+    if engine == "numba" and not NUMBA_AVAILABLE:
+        engine = "step"
+
+    if engine == "numba":
+        if agent_type in COMPILED_POLICIES:
+            kernel_kwargs = {"policy": agent_type}
+        else:
+            kernel_kwargs = {
+                "actions": policy_actions(agent_type, prices, seed=seed)
+            }
+        result = run_episode_kernel(
+            prices,
+            trade_size=trade_size,
+            reward_mode=reward_mode,
+            drawdown_coeff=drawdown_coeff,
+            volatility_coeff=volatility_coeff,
+            trade_penalty_coeff=trade_penalty_coeff,
+            invalid_action_penalty=invalid_action_penalty,
+            inactivity_penalty=inactivity_penalty,
+            **kernel_kwargs,
+        )
+        total_reward = float(result["rewards"].sum())
+        recorder = TrajectoryRecorder.from_arrays(
+            result["values"], result["actions"]
+        )
+        executed_trades = result["executed_trades"]
+    elif engine == "vectorized":
+        action_array = policy_actions(agent_type, prices, seed=seed)
+        result = backtest(
+            prices,
+            action_array,
+            trade_size=trade_size,
+            reward_mode=reward_mode,
+            drawdown_coeff=drawdown_coeff,
+            volatility_coeff=volatility_coeff,
+            trade_penalty_coeff=trade_penalty_coeff,
+            invalid_action_penalty=invalid_action_penalty,
+            inactivity_penalty=inactivity_penalty,
+        )
+        total_reward = float(result["rewards"].sum())
+        recorder = TrajectoryRecorder.from_arrays(
+            result["values"], action_array
+        )
+        executed_trades = result["executed_trades"]
+    elif engine == "step":
+        env = MarketEnvironment(
+            prices,
+            reward_mode=reward_mode,
+            drawdown_coeff=drawdown_coeff,
+            volatility_coeff=volatility_coeff,
+            trade_penalty_coeff=trade_penalty_coeff,
+            invalid_action_penalty=invalid_action_penalty,
+            inactivity_penalty=inactivity_penalty,
+            trade_size=trade_size,
+        )
 
-    if agent_type == "random":
-        agent = RandomAgent(seed=seed)
-    elif agent_type == "rule_based":
-        agent = RuleBasedAgent()
-    elif agent_type == "buy_and_hold":
-        agent = BuyAndHoldAgent()
+        if agent_type == "random":
+            agent = RandomAgent(seed=seed)
+        elif agent_type == "rule_based":
+            agent = RuleBasedAgent()
+        elif agent_type == "buy_and_hold":
+            agent = BuyAndHoldAgent()
+        else:
+            raise ValueError(f"Unknown agent type: {agent_type}")
+
+        state = env.reset()
+        done = False
+
+        total_reward = 0.0
+        if keep_trajectory:
+            recorder = TrajectoryRecorder(len(prices) - 1)
+        else:
+            recorder = OnlineMetrics()
+
+        while not done:
+            action = agent.act(state)
+            state, reward, done = env.step(action)
+
+            total_reward += reward
+            recorder.record(state["portfolio_value"], action)
+        executed_trades = env.executed_trades
     else:
-        raise ValueError(f"Unknown agent type: {agent_type}")
-
-    state = env.reset()
-    done = False
-
-    total_reward = 0.0
-    history = []
-    actions = []
-
-    while not done:
-        action = agent.act(state)
-        state, reward, done = env.step(action)
-
-        total_reward += reward
-        history.append(state["portfolio_value"])
-        actions.append(action)
-
-    returns = compute_returns(history)
-    total_actions = max(1, len(actions))
-    action_counts = {
-        "action_hold_ratio": actions.count(0) / total_actions,
-        "action_buy_ratio": actions.count(1) / total_actions,
-        "action_sell_ratio": actions.count(2) / total_actions,
-        "executed_trade_ratio": env.executed_trades / total_actions,
-    }
-    metrics = {
-        "final_value": history[-1],
-        "total_reward": total_reward,
-        "max_drawdown": max_drawdown(history),
-        "volatility": volatility(returns),
-        "sharpe": sharpe_ratio(returns),
-        "turnover": turnover(env.executed_trades, len(actions)),
-    }
-    metrics.update(action_counts)
-
-    return make_json_serializable({
-        "metrics": metrics,
-        "trajectory": history,
-        "actions": actions,
-    })
+        raise ValueError(f"Unknown engine: {engine}")
+
+    return episode_result(
+        recorder,
+        total_reward,
+        executed_trades,
+        keep_trajectory,
+        rolling_window,
+    )
 
 
 def run_ppo_train_eval(
@@ -117,9 +253,14 @@ def run_ppo_train_eval(
     log_every=5000,
     progress_label="PPO",
     progress_hook=None,
+    n_envs=1,
+    n_workers=0,
+    torch_threads=None,
+    keep_trajectory=True,
+    rolling_window=None,
+    cache=None,
 ):
-    model = train_ppo(
-        train_prices,
+    train_kwargs = dict(
         timesteps=timesteps,
         reward_mode=reward_mode,
         drawdown_coeff=drawdown_coeff,
@@ -129,10 +270,32 @@ def run_ppo_train_eval(
         inactivity_penalty=inactivity_penalty,
         trade_size=trade_size,
         entropy_coef=entropy_coef,
+        n_envs=n_envs,
+        n_workers=n_workers,
+    )
+    if cache is not None:
+        key = result_key(
+            "ppo_train_eval",
+            (train_prices, eval_prices),
+            dict(
+                train_kwargs,
+                keep_trajectory=keep_trajectory,
+                rolling_window=rolling_window,
+            ),
+            seed=PPO_SEED,
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    model = train_ppo(
+        train_prices,
         progress=progress,
         log_every=log_every,
         progress_label=progress_label,
         progress_hook=progress_hook,
+        torch_threads=torch_threads,
+        **train_kwargs,
     )
     env = RLMarketEnv(
         eval_prices,
@@ -148,8 +311,10 @@ def run_ppo_train_eval(
     obs, _ = env.reset()
     done = False
     total_reward = 0.0
-    history = []
-    actions = []
+    if keep_trajectory:
+        recorder = TrajectoryRecorder(len(eval_prices) - 1)
+    else:
+        recorder = OnlineMetrics()
 
     while not done:
         action, _ = model.predict(obs, deterministic=True)
@@ -157,40 +322,24 @@ def run_ppo_train_eval(
 
         done = terminated or truncated
         total_reward += reward
-        history.append(obs[3])  # portfolio value
-        actions.append(int(action))
-
-    returns = compute_returns(history)
-    total_actions = max(1, len(actions))
-    action_counts = {
-        "action_hold_ratio": actions.count(0) / total_actions,
-        "action_buy_ratio": actions.count(1) / total_actions,
-        "action_sell_ratio": actions.count(2) / total_actions,
-        "executed_trade_ratio": env.env.executed_trades / total_actions,
-    }
-    metrics = {
-        "final_value": history[-1],
-        "total_reward": total_reward,
-        "max_drawdown": max_drawdown(history),
-        "volatility": volatility(returns),
-        "sharpe": sharpe_ratio(returns),
-        "turnover": turnover(env.env.executed_trades, len(actions)),
-    }
-    metrics.update(action_counts)
-
-    return make_json_serializable({
-        "metrics": metrics,
-        "trajectory": history,
-        "actions": actions,
-    })
+        recorder.record(obs[3], action)  # portfolio value
+
+    result = episode_result(
+        recorder,
+        total_reward,
+        env.env.executed_trades,
+        keep_trajectory,
+        rolling_window,
+    )
+    if cache is not None:
+        cache.put(key, result)
+    return result
 
 
-# Multi-episode experiment
-def run_experiment(
+def run_batched_episodes(
     prices,
+    seeds,
     agent_type="random",
-    n_episodes=10,
-    seed_start=0,
     reward_mode="raw",
     drawdown_coeff=0.01,
     volatility_coeff=0.01,
@@ -198,14 +347,36 @@ def run_experiment(
     invalid_action_penalty=0.0,
     inactivity_penalty=0.0,
     trade_size=1,
+    keep_trajectory=True,
+    rolling_window=None,
 ):
+    """
+    One episode per seed, stepped together through
+    BatchedMarketEnvironment: each step advances every episode with one
+    NumPy call, and metrics are computed for the whole batch at once.
+    Baseline agents only, since their actions are known up front (see
+    policy_actions). Results match run_episode(engine="step").
+    Episodes run in batches of at most BATCH_CELLS values each.
+    """
+    n_steps = len(prices) - 1
+    batch_size = max(1, BATCH_CELLS // max(n_steps, 1))
     results = []
-
-    for i in range(n_episodes):
-        metrics = run_episode(
+    for i in range(0, len(seeds), batch_size):
+        batch = seeds[i:i + batch_size]
+        if agent_type == "random":
+            actions = np.stack([
+                policy_actions(agent_type, prices, seed=seed)
+                for seed in batch
+            ])
+        else:
+            # Deterministic agents take the same actions in every episode.
+            actions = np.broadcast_to(
+                policy_actions(agent_type, prices),
+                (len(batch), n_steps),
+            )
+        env = BatchedMarketEnvironment(
             prices,
-            agent_type=agent_type,
-            seed=seed_start + i,
+            len(batch),
             reward_mode=reward_mode,
             drawdown_coeff=drawdown_coeff,
             volatility_coeff=volatility_coeff,
@@ -214,8 +385,132 @@ def run_experiment(
             inactivity_penalty=inactivity_penalty,
             trade_size=trade_size,
         )
-        results.append(metrics)
+        step_actions = np.ascontiguousarray(actions.T)
+        state = np.empty((4, len(batch)))
+        values = np.empty((n_steps, len(batch)))
+        # Summed step by step, in the same order as the step engine.
+        total_reward = np.zeros(len(batch))
+        for t in range(n_steps):
+            reward, _ = env.step_array(step_actions[t], state)
+            values[t] = state[3]
+            total_reward += reward
+        values = np.ascontiguousarray(values.T)
+
+        metrics = batch_metrics(
+            values, actions, total_reward, env.executed_trades
+        )
+        for j, episode_metrics in enumerate(metrics):
+            result = {
+                "metrics": episode_metrics,
+                "trajectory": [],
+                "actions": [],
+            }
+            if keep_trajectory:
+                result.update(
+                    trajectory_fields(values[j], actions[j], rolling_window)
+                )
+            results.append(result)
+    return results
+
+
+def run_episode_chunk(prices, seeds, episode_kwargs):
+    # Pool workers receive a shared-memory handle instead of the prices.
+    prices = attach(prices)
+    if episode_kwargs.get("engine") == "batched":
+        kwargs = dict(episode_kwargs)
+        del kwargs["engine"]
+        return run_batched_episodes(prices, seeds, **kwargs)
+    return [
+        run_episode(prices, seed=seed, **episode_kwargs) for seed in seeds
+    ]
+
+
+# Multi-episode experiment
+def run_experiment(
+    prices,
+    agent_type="random",
+    n_episodes=10,
+    seed_start=0,
+    reward_mode="raw",
+    drawdown_coeff=0.01,
+    volatility_coeff=0.01,
+    trade_penalty_coeff=0.0,
+    invalid_action_penalty=0.0,
+    inactivity_penalty=0.0,
+    trade_size=1,
+    engine="step",
+    n_jobs=1,
+    keep_trajectory=True,
+    rolling_window=None,
+    cache=None,
+):
+    """
+    n_jobs > 1 spreads episodes over a process pool in chunks. Episode i
+    always uses seed seed_start + i, so results do not depend on n_jobs.
+    engine="batched" steps each chunk of episodes together through
+    BatchedMarketEnvironment instead of one episode at a time.
+    With a ResultCache, a run with the same prices and settings is
+    returned from the cache instead of being recomputed.
+    """
+    episode_kwargs = dict(
+        agent_type=agent_type,
+        reward_mode=reward_mode,
+        drawdown_coeff=drawdown_coeff,
+        volatility_coeff=volatility_coeff,
+        trade_penalty_coeff=trade_penalty_coeff,
+        invalid_action_penalty=invalid_action_penalty,
+        inactivity_penalty=inactivity_penalty,
+        trade_size=trade_size,
+        engine=engine,
+        keep_trajectory=keep_trajectory,
+        rolling_window=rolling_window,
+    )
+    if cache is not None:
+        key = result_key(
+            "experiment",
+            prices,
+            dict(episode_kwargs, n_episodes=n_episodes),
+            seed=seed_start,
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    seeds = list(range(seed_start, seed_start + n_episodes))
+
+    if n_jobs > 1 and n_episodes > 1:
+        # A few chunks per worker keeps the pool balanced.
+        n_chunks = min(n_episodes, n_jobs * 4)
+        chunk_size = -(-n_episodes // n_chunks)
+        chunks = [
+            seeds[i:i + chunk_size]
+            for i in range(0, n_episodes, chunk_size)
+        ]
+        # Workers attach to one shared-memory copy of the prices.
+        with shared_prices(prices) as handle, ProcessPoolExecutor(
+            max_workers=n_jobs
+        ) as pool:
+            futures = [
+                pool.submit(run_episode_chunk, handle, chunk, episode_kwargs)
+                for chunk in chunks
+            ]
+            results = [r for f in futures for r in f.result()]
+    else:
+        results = run_episode_chunk(prices, seeds, episode_kwargs)
+
+    # Episode results are JSON-ready already.
+    result = {
+        "summary": summarize_episodes(results, agent_type, reward_mode),
+        "episodes": results,
+    }
+    if cache is not None:
+        cache.put(key, result)
+    return result
+
 
+def summarize_episodes(
+    results, agent_type, reward_mode, n_resamples=SUMMARY_RESAMPLES
+):
     final_values = [r["metrics"]["final_value"] for r in results]
     rewards = [r["metrics"]["total_reward"] for r in results]
     drawdowns = [r["metrics"]["max_drawdown"] for r in results]
@@ -225,7 +520,7 @@ def run_experiment(
 
     summary = {
         "agent": agent_type,
-        "episodes": n_episodes,
+        "episodes": len(results),
         "final_value_mean": sum(final_values) / len(final_values),
         "reward_mean": sum(rewards) / len(rewards),
         "best_final_value": max(final_values),
@@ -236,11 +531,17 @@ def run_experiment(
         "turnover_mean": sum(turnovers) / len(turnovers),
         "reward_mode": reward_mode,
     }
-
-    return make_json_serializable({
-        "summary": summary,
-        "episodes": results,
-    })
+    if n_resamples > 0:
+        low, high = bootstrap_ci(
+            np.column_stack([final_values, rewards, sharpes]),
+            n_resamples=n_resamples,
+        )
+        # None (JSON null) where there are too few episodes for an interval.
+        low, high = nan_to_none(low), nan_to_none(high)
+        for j, name in enumerate(["final_value", "reward", "sharpe"]):
+            summary[f"{name}_ci_low"] = low[j]
+            summary[f"{name}_ci_high"] = high[j]
+    return summary
 
 
 # PPO episode
@@ -259,9 +560,14 @@ def run_ppo_episode(
     log_every=5000,
     progress_label="PPO",
     progress_hook=None,
+    n_envs=1,
+    n_workers=0,
+    torch_threads=None,
+    keep_trajectory=True,
+    rolling_window=None,
+    cache=None,
 ):
-    model = train_ppo(
-        prices,
+    train_kwargs = dict(
         timesteps=timesteps,
         reward_mode=reward_mode,
         drawdown_coeff=drawdown_coeff,
@@ -271,10 +577,32 @@ def run_ppo_episode(
         inactivity_penalty=inactivity_penalty,
         trade_size=trade_size,
         entropy_coef=entropy_coef,
+        n_envs=n_envs,
+        n_workers=n_workers,
+    )
+    if cache is not None:
+        key = result_key(
+            "ppo",
+            prices,
+            dict(
+                train_kwargs,
+                keep_trajectory=keep_trajectory,
+                rolling_window=rolling_window,
+            ),
+            seed=PPO_SEED,
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    model = train_ppo(
+        prices,
         progress=progress,
         log_every=log_every,
         progress_label=progress_label,
         progress_hook=progress_hook,
+        torch_threads=torch_threads,
+        **train_kwargs,
     )
     env = RLMarketEnv(
         prices,
@@ -290,8 +618,10 @@ def run_ppo_episode(
     obs, _ = env.reset()
     done = False
     total_reward = 0.0
-    history = []
-    actions = []
+    if keep_trajectory:
+        recorder = TrajectoryRecorder(len(prices) - 1)
+    else:
+        recorder = OnlineMetrics()
 
     while not done:
         action, _ = model.predict(obs, deterministic=True)
@@ -299,49 +629,232 @@ def run_ppo_episode(
 
         done = terminated or truncated
         total_reward += reward
-        history.append(obs[3])  # portfolio value
-        actions.append(int(action))
-
-    returns = compute_returns(history)
-    total_actions = max(1, len(actions))
-    action_counts = {
-        "action_hold_ratio": actions.count(0) / total_actions,
-        "action_buy_ratio": actions.count(1) / total_actions,
-        "action_sell_ratio": actions.count(2) / total_actions,
-        "executed_trade_ratio": env.env.executed_trades / total_actions,
-    }
-    metrics = {
-        "final_value": history[-1],
-        "total_reward": total_reward,
-        "max_drawdown": max_drawdown(history),
-        "volatility": volatility(returns),
-        "sharpe": sharpe_ratio(returns),
-        "turnover": turnover(env.env.executed_trades, len(actions)),
-    }
-    metrics.update(action_counts)
+        recorder.record(obs[3], action)  # portfolio value
+
+    result = episode_result(
+        recorder,
+        total_reward,
+        env.env.executed_trades,
+        keep_trajectory,
+        rolling_window,
+    )
+    if cache is not None:
+        cache.put(key, result)
+    return result
+
+
+# Multi-asset episodes (random / PPO)
+def multi_asset_action_kinds(actions):
+    """
+    Action 0 is HOLD; odd actions buy and even non-zero actions sell.
+    """
+    kinds = np.where(actions % 2 == 1, 1, 2)
+    kinds[actions == 0] = 0
+    return kinds
+
+
+def run_multi_asset_episode(
+    price_matrix,
+    agent_type="random",
+    seed=None,
+    trade_size=1,
+):
+    env = MultiAssetMarketEnvironment(price_matrix, trade_size=trade_size)
+
+    if agent_type == "random":
+        agent = RandomAgent(
+            action_space=tuple(range(env.action_space_size)), seed=seed
+        )
+    else:
+        raise ValueError(
+            f"Agent type not supported for multi-asset runs: {agent_type}"
+        )
+
+    state = env.reset()
+    done = False
+
+    total_reward = 0.0
+    recorder = TrajectoryRecorder(env.timesteps - 1, action_dtype=np.int32)
+
+    while not done:
+        action = agent.act(state)
+        state, reward, done = env.step(action)
+
+        total_reward += reward
+        recorder.record(env.portfolio_value, action)
+
+    metrics = recorder.metrics(
+        total_reward,
+        env.executed_trades,
+        action_kinds=multi_asset_action_kinds(recorder.actions),
+    )
 
     return make_json_serializable({
         "metrics": metrics,
-        "trajectory": history,
-        "actions": actions,
+        "trajectory": recorder.values.tolist(),
+        "actions": recorder.actions.tolist(),
     })
 
 
+def run_multi_asset_experiment(
+    price_matrix,
+    agent_type="random",
+    n_episodes=10,
+    seed_start=0,
+    trade_size=1,
+    cache=None,
+):
+    if cache is not None:
+        key = result_key(
+            "multi_asset_experiment",
+            price_matrix,
+            dict(
+                agent_type=agent_type,
+                n_episodes=n_episodes,
+                trade_size=trade_size,
+            ),
+            seed=seed_start,
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    results = [
+        run_multi_asset_episode(
+            price_matrix,
+            agent_type=agent_type,
+            seed=seed_start + i,
+            trade_size=trade_size,
+        )
+        for i in range(n_episodes)
+    ]
+
+    # The multi-asset env always applies its own risk shaping.
+    result = make_json_serializable({
+        "summary": summarize_episodes(results, agent_type, "risk_adjusted"),
+        "episodes": results,
+    })
+    if cache is not None:
+        cache.put(key, result)
+    return result
+
+
+def run_ppo_multi_asset_episode(
+    price_matrix,
+    timesteps=10_000,
+    trade_size=1,
+    entropy_coef=0.0,
+    progress=False,
+    log_every=5000,
+    progress_label="PPO",
+    progress_hook=None,
+    n_envs=1,
+    n_workers=0,
+    torch_threads=None,
+    cache=None,
+):
+    train_kwargs = dict(
+        timesteps=timesteps,
+        trade_size=trade_size,
+        entropy_coef=entropy_coef,
+        n_envs=n_envs,
+        n_workers=n_workers,
+    )
+    if cache is not None:
+        key = result_key(
+            "ppo_multi_asset", price_matrix, train_kwargs, seed=PPO_SEED
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    model = train_ppo(
+        price_matrix,
+        progress=progress,
+        log_every=log_every,
+        progress_label=progress_label,
+        progress_hook=progress_hook,
+        torch_threads=torch_threads,
+        **train_kwargs,
+    )
+    env = RLMultiAssetEnv(price_matrix, trade_size=trade_size)
+
+    obs, _ = env.reset()
+    done = False
+    total_reward = 0.0
+    recorder = TrajectoryRecorder(
+        env.env.timesteps - 1, action_dtype=np.int32
+    )
+
+    while not done:
+        action, _ = model.predict(obs, deterministic=True)
+        obs, reward, terminated, truncated, _ = env.step(action)
+
+        done = terminated or truncated
+        total_reward += reward
+        recorder.record(env.env.portfolio_value, action)
+
+    metrics = recorder.metrics(
+        total_reward,
+        env.env.executed_trades,
+        action_kinds=multi_asset_action_kinds(recorder.actions),
+    )
+
+    result = make_json_serializable({
+        "metrics": metrics,
+        "trajectory": recorder.values.tolist(),
+        "actions": recorder.actions.tolist(),
+    })
+    if cache is not None:
+        cache.put(key, result)
+    return result
+
+
 # Config-driven dispatcher
 def run_configured_experiment(
     config: ExperimentConfig,
     progress=False,
     log_every=5000,
     progress_hook=None,
+    cache=None,
 ):
-    if config.schedule:
-        prices = regime_schedule(
-            config.schedule, length=config.schedule_length
+    """
+    Run config on its scenario prices. cache is an optional ResultCache
+    consulted by the underlying runner.
+    """
+    if config.assets or config.scenario in MULTI_ASSET_SCENARIOS:
+        if config.assets:
+            price_matrix = cached_series(
+                scenario_key("assets", {"assets": config.assets}),
+                lambda: multi_asset_prices(config.assets),
+            )
+        else:
+            price_matrix = get_scenario(config.scenario)
+        if config.agent_type == "ppo":
+            return run_ppo_multi_asset_episode(
+                price_matrix,
+                timesteps=config.timesteps,
+                trade_size=config.trade_size,
+                n_envs=config.n_envs,
+                n_workers=config.n_workers,
+                torch_threads=config.torch_threads,
+                progress=progress,
+                log_every=log_every,
+                progress_hook=progress_hook,
+                cache=cache,
+            )
+        return run_multi_asset_experiment(
+            price_matrix,
+            agent_type=config.agent_type,
+            n_episodes=config.episodes,
+            trade_size=config.trade_size,
+            cache=cache,
         )
+
+    if config.schedule:
+        prices = get_schedule(config.schedule, length=config.schedule_length)
     else:
-        if config.scenario not in SCENARIOS:
-            raise ValueError(f"Unknown market scenario: {config.scenario}")
-        prices = SCENARIOS[config.scenario]()
+        prices = get_scenario(config.scenario)
 
     if config.agent_type == "ppo":
         return run_ppo_episode(
@@ -354,9 +867,14 @@ def run_configured_experiment(
             invalid_action_penalty=config.invalid_action_penalty,
             inactivity_penalty=config.inactivity_penalty,
             trade_size=config.trade_size,
+            n_envs=config.n_envs,
+            n_workers=config.n_workers,
+            torch_threads=config.torch_threads,
+            rolling_window=config.rolling_window,
             progress=progress,
             log_every=log_every,
             progress_hook=progress_hook,
+            cache=cache,
         )
 
     return run_experiment(
@@ -370,6 +888,8 @@ def run_configured_experiment(
         invalid_action_penalty=config.invalid_action_penalty,
         inactivity_penalty=config.inactivity_penalty,
         trade_size=config.trade_size,
+        rolling_window=config.rolling_window,
+        cache=cache,
     )
 
 
@@ -4,6 +4,9 @@ import math
 import statistics
 from collections import defaultdict
 
+import numpy as np
+
+from backend.simulations.bootstrap import bootstrap_ci, bootstrap_pvalue
 from backend.simulations.metrics import METRICS
 
 
@@ -23,6 +26,29 @@ def parse_args():
         default="experiments/results/benchmark_summary.csv",
         help="Output summary CSV path.",
     )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=10_000,
+        help="Bootstrap resamples for confidence intervals (0 to disable).",
+    )
+    parser.add_argument(
+        "--ci",
+        type=float,
+        default=0.95,
+        help="Confidence level for bootstrap intervals.",
+    )
+    parser.add_argument(
+        "--baseline",
+        default="rule_based",
+        help="Agent to compare against with bootstrap p-values.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for bootstrap resampling.",
+    )
     return parser.parse_args()
 
 
@@ -39,7 +65,21 @@ def to_float(value):
         return math.nan
 
 
-def summarize(rows):
+def metric_matrix(items):
+    return np.array(
+        [[to_float(i[metric]) for metric in METRICS] for i in items],
+        dtype=np.float64,
+    ).reshape(len(items), len(METRICS))
+
+
+def summarize(rows, n_resamples=0, ci=0.95, baseline=None, seed=0):
+    """
+    Mean/std per (scenario, reward_mode, agent) cell. With n_resamples > 0,
+    adds bootstrap CI columns for every metric and, when a baseline agent
+    is present in the same scenario and reward mode, two-sample p-values
+    against it. Runs are not paired: PPO repeats and baseline episodes
+    share no seed, so their run_ids do not correspond.
+    """
     grouped = defaultdict(list)
     for row in rows:
         agent = row.get("agent") or "ppo"
@@ -63,6 +103,28 @@ def summarize(rows):
             )
             out[f"{metric}_mean"] = mean
             out[f"{metric}_std"] = std
+
+        if n_resamples > 0:
+            low, high = bootstrap_ci(
+                metric_matrix(items), n_resamples=n_resamples, ci=ci, seed=seed
+            )
+            for j, metric in enumerate(METRICS):
+                out[f"{metric}_ci_low"] = float(low[j])
+                out[f"{metric}_ci_high"] = float(high[j])
+
+            if baseline:
+                baseline_items = grouped.get((scenario, reward_mode, baseline))
+                p_values = np.full(len(METRICS), math.nan)
+                if baseline_items and agent != baseline:
+                    p_values = bootstrap_pvalue(
+                        metric_matrix(items),
+                        metric_matrix(baseline_items),
+                        n_resamples=n_resamples,
+                        seed=seed,
+                    )
+                out["baseline"] = baseline
+                for j, metric in enumerate(METRICS):
+                    out[f"{metric}_p_value"] = float(p_values[j])
         summary_rows.append(out)
 
     return summary_rows
@@ -81,7 +143,13 @@ def write_summary(path, rows):
 def main():
     args = parse_args()
     rows = load_rows(args.in_path)
-    summary = summarize(rows)
+    summary = summarize(
+        rows,
+        n_resamples=args.bootstrap,
+        ci=args.ci,
+        baseline=args.baseline,
+        seed=args.seed,
+    )
     write_summary(args.out_path, summary)
     print(f"Wrote summary to {args.out_path}")
 
@@ -0,0 +1,182 @@
+import math
+
+import numpy as np
+
+from backend.simulations.metrics import (
+    action_ratios,
+    compute_returns,
+    max_drawdown,
+    sharpe_ratio,
+    turnover,
+    volatility,
+)
+
+
+class TrajectoryRecorder:
+    """
+    Preallocated per-step portfolio values and actions for one episode.
+    """
+
+    __slots__ = ("_values", "_actions", "size")
+
+    def __init__(self, n_steps, action_dtype=np.int8):
+        self._values = np.empty(n_steps, dtype=np.float64)
+        self._actions = np.empty(n_steps, dtype=action_dtype)
+        self.size = 0
+
+    @classmethod
+    def from_arrays(cls, values, actions):
+        recorder = cls.__new__(cls)
+        recorder._values = np.asarray(values, dtype=np.float64)
+        recorder._actions = np.asarray(actions)
+        recorder.size = len(recorder._values)
+        return recorder
+
+    def record(self, value, action):
+        i = self.size
+        self._values[i] = value
+        self._actions[i] = action
+        self.size = i + 1
+
+    @property
+    def values(self):
+        return self._values[:self.size]
+
+    @property
+    def actions(self):
+        return self._actions[:self.size]
+
+    def metrics(self, total_reward, executed_trades, action_kinds=None):
+        """
+        action_kinds maps actions to 0 = HOLD, 1 = BUY, 2 = SELL when the
+        recorded actions use a wider action space.
+        """
+        if action_kinds is None:
+            action_kinds = self.actions
+        returns = compute_returns(self.values)
+        total_actions = max(1, self.size)
+        hold, buy, sell = action_ratios(action_kinds).tolist()
+        metrics = {
+            "final_value": float(self.values[-1]),
+            "total_reward": total_reward,
+            "max_drawdown": max_drawdown(self.values),
+            "volatility": volatility(returns),
+            "sharpe": sharpe_ratio(returns),
+            "turnover": turnover(executed_trades, self.size),
+            "action_hold_ratio": hold,
+            "action_buy_ratio": buy,
+            "action_sell_ratio": sell,
+            "executed_trade_ratio": executed_trades / total_actions,
+        }
+        return metrics
+
+
+def batch_metrics(values, actions, total_rewards, executed_trades):
+    """
+    TrajectoryRecorder.metrics for equal-length episodes at once: values
+    and actions are (episodes, T) matrices, total_rewards and
+    executed_trades hold one entry per episode. Returns one metrics dict
+    per episode.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    executed_trades = np.asarray(executed_trades)
+    n_steps = values.shape[-1]
+    returns = compute_returns(values)
+    ratios = action_ratios(actions)
+    columns = {
+        "final_value": values[:, -1],
+        "total_reward": total_rewards,
+        "max_drawdown": max_drawdown(values),
+        "volatility": volatility(returns),
+        "sharpe": sharpe_ratio(returns),
+        "turnover": turnover(executed_trades, n_steps),
+        "action_hold_ratio": ratios[:, 0],
+        "action_buy_ratio": ratios[:, 1],
+        "action_sell_ratio": ratios[:, 2],
+        "executed_trade_ratio": executed_trades / max(1, n_steps),
+    }
+    names = list(columns)
+    rows = zip(*(
+        np.asarray(column, dtype=np.float64).tolist()
+        for column in columns.values()
+    ))
+    return [dict(zip(names, row)) for row in rows]
+
+
+class OnlineMetrics:
+    """
+    Constant-memory replacement for TrajectoryRecorder when the episode
+    trajectory does not need to be kept. Returns feed Welford mean/variance
+    for volatility and Sharpe; a running peak tracks max drawdown.
+    """
+
+    __slots__ = (
+        "size",
+        "last_value",
+        "peak",
+        "max_dd",
+        "n_returns",
+        "mean",
+        "m2",
+        "action_counts",
+    )
+
+    def __init__(self, n_actions=3):
+        self.size = 0
+        self.last_value = None
+        self.peak = None
+        self.max_dd = 0.0
+        self.n_returns = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.action_counts = [0] * n_actions
+
+    def record(self, value, action):
+        value = float(value)
+        prev = self.last_value
+        if prev is None:
+            self.peak = value
+        else:
+            ret = (value - prev) / prev if prev != 0 else 0.0
+            self.n_returns += 1
+            delta = ret - self.mean
+            self.mean += delta / self.n_returns
+            self.m2 += delta * (ret - self.mean)
+            if value > self.peak:
+                self.peak = value
+        if self.peak > 0:
+            dd = (self.peak - value) / self.peak
+            if dd > self.max_dd:
+                self.max_dd = dd
+
+        self.last_value = value
+        self.action_counts[int(action)] += 1
+        self.size += 1
+
+    def volatility(self):
+        if self.n_returns == 0:
+            return 0.0
+        return math.sqrt(self.m2 / self.n_returns)
+
+    def sharpe(self):
+        vol = self.volatility()
+        if vol == 0.0:
+            return 0.0
+        return self.mean / vol * math.sqrt(self.n_returns)
+
+    def metrics(self, total_reward, executed_trades):
+        total_actions = max(1, self.size)
+        hold, buy, sell = self.action_counts[:3]
+        metrics = {
+            "final_value": self.last_value,
+            "total_reward": total_reward,
+            "max_drawdown": self.max_dd,
+            "volatility": self.volatility(),
+            "sharpe": self.sharpe(),
+            "turnover": turnover(executed_trades, self.size),
+            "action_hold_ratio": hold / total_actions,
+            "action_buy_ratio": buy / total_actions,
+            "action_sell_ratio": sell / total_actions,
+            "executed_trade_ratio": executed_trades / total_actions,
+        }
+        return metrics
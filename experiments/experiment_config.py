@@ -18,6 +18,11 @@ class ExperimentConfig:
         invalid_action_penalty: float = 0.0,
         inactivity_penalty: float = 0.0,
         trade_size: int = 1,
+        n_envs: int = 1,
+        n_workers: int = 0,
+        torch_threads: int | None = None,
+        assets: list | None = None,
+        rolling_window: int | None = None,
     ):
         self.scenario = scenario
         self.agent_type = agent_type
@@ -32,6 +37,11 @@ class ExperimentConfig:
         self.invalid_action_penalty = invalid_action_penalty
         self.inactivity_penalty = inactivity_penalty
         self.trade_size = trade_size
+        self.n_envs = n_envs
+        self.n_workers = n_workers
+        self.torch_threads = torch_threads
+        self.assets = assets
+        self.rolling_window = rolling_window
 
     def __repr__(self):
         return (
@@ -48,5 +58,10 @@ class ExperimentConfig:
             f"trade_penalty_coeff={self.trade_penalty_coeff}, "
             f"invalid_action_penalty={self.invalid_action_penalty}, "
             f"inactivity_penalty={self.inactivity_penalty}, "
-            f"trade_size={self.trade_size})"
+            f"trade_size={self.trade_size}, "
+            f"n_envs={self.n_envs}, "
+            f"n_workers={self.n_workers}, "
+            f"torch_threads={self.torch_threads}, "
+            f"assets={self.assets}, "
+            f"rolling_window={self.rolling_window})"
         )
@@ -1,3 +1,9 @@
+from experiments.stochastic_scenarios import (
+    MULTI_ASSET_SCENARIOS,
+    STOCHASTIC_SCENARIOS,
+)
+
+
 def bull_market(length=20, start=100, step=2):
     return [start + i * step for i in range(length)]
 
@@ -54,4 +60,19 @@ SCENARIOS = {
     **BASE_SCENARIOS,
     "regime_shift_short": regime_shift_short,
     "regime_shift_long": regime_shift_long,
+    **STOCHASTIC_SCENARIOS,
 }
+
+
+def multi_asset_prices(assets):
+    """
+    Stack named scenarios into a (num_assets, timesteps) price matrix.
+    Series are truncated to the shortest one.
+    """
+    series = []
+    for name in assets:
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown market scenario: {name}")
+        series.append(SCENARIOS[name]())
+    length = min(len(s) for s in series)
+    return [s[:length] for s in series]
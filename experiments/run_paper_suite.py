@@ -71,10 +71,45 @@ def parse_args():
         default=0.1,
         help="Volatility penalty coefficient.",
     )
+    parser.add_argument(
+        "--n-envs",
+        type=int,
+        default=1,
+        help="Parallel env copies per PPO training run.",
+    )
+    parser.add_argument(
+        "--n-workers",
+        type=int,
+        default=0,
+        help="Subprocess workers for PPO env stepping.",
+    )
+    parser.add_argument(
+        "--torch-threads",
+        type=int,
+        default=0,
+        help="Cap torch intra-op threads (0 = torch default).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Parallel benchmark grid cells.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default="",
+        help="Result cache directory (default: <out-dir>/.result_cache).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute every run instead of reusing cached results.",
+    )
     parser.add_argument(
         "--prices-csv",
         default="",
-        help="Optional prices CSV for real-world validation.",
+        help="Optional prices CSV or Parquet/Feather file for real-world "
+        "validation.",
     )
     parser.add_argument(
         "--price-col",
@@ -86,6 +121,26 @@ def parse_args():
         default="Date",
         help="Date column for sorting.",
     )
+    parser.add_argument(
+        "--start",
+        default="",
+        help="First date to use from the prices file (ISO, inclusive).",
+    )
+    parser.add_argument(
+        "--end",
+        default="",
+        help="Last date to use from the prices file (ISO, inclusive).",
+    )
+    parser.add_argument(
+        "--split-date",
+        default="",
+        help="Train before this date, evaluate from it.",
+    )
+    parser.add_argument(
+        "--bar-freq",
+        default="",
+        help="Aggregate ticks into bars (e.g. 1m, 1h, 1d) before running.",
+    )
     parser.add_argument(
         "--train-ratio",
         type=float,
@@ -149,9 +204,25 @@ def main():
         str(args.drawdown_coeff),
         "--volatility-coeff",
         str(args.volatility_coeff),
+        "--n-envs",
+        str(args.n_envs),
+        "--n-workers",
+        str(args.n_workers),
+        "--torch-threads",
+        str(args.torch_threads),
+        "--workers",
+        str(args.workers),
         "--out",
         results,
     ]
+    if not args.no_cache:
+        cmd.extend(
+            [
+                "--cache-dir",
+                args.cache_dir
+                or os.path.join(args.out_dir, ".result_cache"),
+            ]
+        )
     if args.prices_csv:
         cmd.extend(
             [
@@ -165,6 +236,14 @@ def main():
                 str(args.train_ratio),
             ]
         )
+        for flag, value in (
+            ("--start", args.start),
+            ("--end", args.end),
+            ("--split-date", args.split_date),
+            ("--bar-freq", args.bar_freq),
+        ):
+            if value:
+                cmd.extend([flag, value])
     if args.ppo_progress:
         cmd.extend(
             ["--ppo-progress", "--ppo-log-every", str(args.ppo_log_every)]
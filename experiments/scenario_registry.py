@@ -0,0 +1,263 @@
+import atexit
+import json
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from experiments.market_scenarios import (
+    MULTI_ASSET_SCENARIOS,
+    SCENARIOS,
+    regime_schedule,
+)
+
+
+# Generated or loaded series by key, least recently used first; arrays
+# are read-only so callers can share them freely. Values are arrays or
+# tuples of arrays (or None). At most MAX_CACHED entries are kept.
+_CACHE = OrderedDict()
+MAX_CACHED = 32
+
+# Shared-memory blocks published by this process, keyed by array id.
+_PUBLISHED = {}
+
+# Open shared_prices blocks per published array id.
+_LEASES = {}
+
+# Blocks attached by this (worker) process, keyed by block name, with a
+# weak reference to the view handed out.
+_ATTACHED = {}
+
+
+def _normalize(value):
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items())}
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def scenario_key(name, params=None, seed=None):
+    """
+    Hashable cache key for (name, params, seed).
+    """
+    params = json.dumps(
+        _normalize(params or {}), sort_keys=True, default=repr
+    )
+    return (name, params, seed)
+
+
+def _read_only(values):
+    if values is None:
+        return None
+    if isinstance(values, tuple):
+        return tuple(_read_only(v) for v in values)
+    if isinstance(values, np.ndarray):
+        if not values.flags.writeable:
+            # Already immutable (e.g. a read-only memory map): no copy.
+            return values
+        array = values.copy()
+    else:
+        array = np.array(values, dtype=np.float64)
+    array.setflags(write=False)
+    return array
+
+
+def _arrays(value):
+    if isinstance(value, tuple):
+        return [v for v in value if isinstance(v, np.ndarray)]
+    if isinstance(value, np.ndarray):
+        return [value]
+    return []
+
+
+def cached_series(key, loader):
+    """
+    Return the value cached under key, calling loader() to build it on
+    first use. Arrays (alone or in a tuple) are stored read-only. The
+    least recently used entries beyond MAX_CACHED are dropped, along
+    with their shared-memory blocks.
+    """
+    if key in _CACHE:
+        _CACHE.move_to_end(key)
+        return _CACHE[key]
+    value = _CACHE[key] = _read_only(loader())
+    while len(_CACHE) > MAX_CACHED:
+        _, evicted = _CACHE.popitem(last=False)
+        for array in _arrays(evicted):
+            if not _is_cached(array):
+                _unpublish(array)
+    return value
+
+
+def _is_cached(array):
+    return any(v is array for value in _CACHE.values() for v in _arrays(value))
+
+
+def get_scenario(name, seed=None, **params):
+    """
+    Prices for a named scenario (single-asset or multi-asset) as a cached
+    read-only float64 array. params and seed are passed to the scenario
+    function; seed is omitted for deterministic scenarios when None.
+    """
+    if name in SCENARIOS:
+        build = SCENARIOS[name]
+    elif name in MULTI_ASSET_SCENARIOS:
+        build = MULTI_ASSET_SCENARIOS[name]
+    else:
+        raise ValueError(f"Unknown market scenario: {name}")
+    kwargs = dict(params)
+    if seed is not None:
+        kwargs["seed"] = seed
+    return cached_series(
+        scenario_key(name, params, seed), lambda: build(**kwargs)
+    )
+
+
+def get_schedule(regimes, length=20):
+    """
+    Cached read-only regime_schedule(regimes, length).
+    """
+    regimes = list(regimes)
+    return cached_series(
+        scenario_key("schedule", {"regimes": regimes, "length": length}),
+        lambda: regime_schedule(regimes, length=length),
+    )
+
+
+def clear_cache():
+    evicted = [a for value in _CACHE.values() for a in _arrays(value)]
+    _CACHE.clear()
+    for array in evicted:
+        _unpublish(array)
+
+
+class SharedPrices:
+    """
+    Picklable handle to a price array published in shared memory.
+    """
+
+    __slots__ = ("name", "shape", "dtype")
+
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+    def __getstate__(self):
+        return (self.name, self.shape, self.dtype)
+
+    def __setstate__(self, state):
+        self.name, self.shape, self.dtype = state
+
+
+def publish(array):
+    """
+    Copy array into a new shared-memory block and return its handle.
+    Arrays already published by this process reuse their block.
+    """
+    entry = _PUBLISHED.get(id(array))
+    if entry is not None and entry[0] is array:
+        return entry[2]
+    values = np.asarray(array)
+    shm = shared_memory.SharedMemory(
+        create=True, size=max(1, values.nbytes)
+    )
+    view = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)
+    view[...] = values
+    handle = SharedPrices(shm.name, values.shape, values.dtype.str)
+    # Keep the source alive so its id is not reused while published.
+    _PUBLISHED[id(array)] = (array, shm, handle)
+    return handle
+
+
+def release(handle):
+    """
+    Unlink a block published by this process.
+    """
+    for key, (_, shm, published) in list(_PUBLISHED.items()):
+        if published is handle:
+            del _PUBLISHED[key]
+            shm.close()
+            shm.unlink()
+            return
+
+
+def _unpublish(array):
+    # Release array's block unless a shared_prices block still uses it.
+    entry = _PUBLISHED.get(id(array))
+    if entry is not None and entry[0] is array and id(array) not in _LEASES:
+        release(entry[2])
+
+
+@contextmanager
+def shared_prices(array):
+    """
+    Handle to array in shared memory for the duration of the block.
+    Cached registry arrays stay published while they are cached; other
+    arrays are unlinked on exit.
+    """
+    handle = publish(array)
+    key = id(array)
+    _LEASES[key] = _LEASES.get(key, 0) + 1
+    try:
+        yield handle
+    finally:
+        _LEASES[key] -= 1
+        if not _LEASES[key]:
+            del _LEASES[key]
+            if not _is_cached(array):
+                release(handle)
+
+
+def _detach_unused(keep):
+    # Close blocks whose views are gone, so blocks the publisher has
+    # since unlinked do not stay mapped in long-lived workers.
+    for name, (shm, ref) in list(_ATTACHED.items()):
+        if name == keep or ref() is not None:
+            continue
+        try:
+            shm.close()
+        except BufferError:
+            # A slice of the view still maps the block; retry later.
+            continue
+        del _ATTACHED[name]
+
+
+def attach(prices):
+    """
+    Read-only array view of a SharedPrices handle (attached once per
+    process while a view is in use); anything else is returned
+    unchanged.
+    """
+    if not isinstance(prices, SharedPrices):
+        return prices
+    _detach_unused(prices.name)
+    entry = _ATTACHED.get(prices.name)
+    view = entry[1]() if entry is not None else None
+    if view is None:
+        if entry is not None:
+            shm = entry[0]
+        else:
+            # Workers share the publisher's resource tracker, so
+            # attaching does not add a second owner; only the publisher
+            # unlinks.
+            shm = shared_memory.SharedMemory(name=prices.name)
+        view = np.ndarray(prices.shape, dtype=prices.dtype, buffer=shm.buf)
+        view.setflags(write=False)
+        _ATTACHED[prices.name] = (shm, weakref.ref(view))
+    return view
+
+
+@atexit.register
+def _release_all():
+    for _, shm, _ in list(_PUBLISHED.values()):
+        shm.close()
+        shm.unlink()
+    _PUBLISHED.clear()
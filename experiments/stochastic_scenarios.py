@@ -0,0 +1,327 @@
+import numpy as np
+
+
+# Per-step (drift, volatility) of log prices for each regime, named after
+# the deterministic base scenarios.
+REGIME_PARAMS = {
+    "bull": (0.01, 0.01),
+    "bear": (-0.01, 0.015),
+    "sideways": (0.0, 0.003),
+    "volatile": (0.0, 0.04),
+}
+
+
+def _prices_from_log_returns(log_returns, start):
+    """
+    (n_paths, T - 1) log returns -> (n_paths, T) prices starting at start.
+    """
+    n_paths, steps = log_returns.shape
+    prices = np.empty((n_paths, steps + 1), dtype=np.float64)
+    prices[:, 0] = 0.0
+    np.cumsum(log_returns, axis=1, out=prices[:, 1:])
+    np.exp(prices, out=prices)
+    prices *= start
+    return prices
+
+
+def gbm_paths(
+    n_paths,
+    length,
+    start=100.0,
+    mu=0.0005,
+    sigma=0.01,
+    dt=1.0,
+    seed=None,
+):
+    """
+    Geometric Brownian motion, shape (n_paths, length).
+    mu and sigma are the drift and volatility per unit of dt.
+    """
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal((n_paths, length - 1))
+    shocks *= sigma * np.sqrt(dt)
+    shocks += (mu - 0.5 * sigma * sigma) * dt
+    return _prices_from_log_returns(shocks, start)
+
+
+def _default_transition(n_states, stay):
+    move = (1.0 - stay) / max(1, n_states - 1)
+    matrix = np.full((n_states, n_states), move)
+    np.fill_diagonal(matrix, stay if n_states > 1 else 1.0)
+    return matrix
+
+
+def regime_path_states(
+    n_paths,
+    length,
+    transition,
+    initial=None,
+    rng=None,
+):
+    """
+    Markov regime indices, shape (n_paths, length).
+
+    Rather than stepping the chain one time step at a time, each regime
+    visit draws its geometric holding time and the next regime at once,
+    so the loop runs once per regime switch, vectorized across paths.
+    """
+    rng = np.random.default_rng(rng)
+    transition = np.asarray(transition, dtype=np.float64)
+    n_states = len(transition)
+    stay = np.diag(transition)
+    # Distribution of the next regime given that the current one ends.
+    leave = transition * (1.0 - np.eye(n_states))
+    totals = leave.sum(axis=1, keepdims=True)
+    leave = np.divide(
+        leave, totals, out=np.zeros_like(leave), where=totals > 0
+    )
+    leave_cdf = np.cumsum(leave, axis=1)
+
+    if initial is None:
+        state = rng.integers(0, n_states, size=n_paths)
+    else:
+        state = np.full(n_paths, int(initial), dtype=np.int64)
+
+    # Mark the regime at the start of each run, then forward-fill.
+    states = np.zeros((n_paths, length), dtype=np.int64)
+    marked = np.zeros((n_paths, length), dtype=bool)
+    pos = np.zeros(n_paths, dtype=np.int64)
+    active = np.arange(n_paths)
+    while len(active):
+        s = state[active]
+        start = pos[active]
+        states[active, start] = s
+        marked[active, start] = True
+
+        p_leave = 1.0 - stay[s]
+        can_leave = p_leave > 0
+        hold = np.full(len(active), length, dtype=np.int64)
+        hold[can_leave] = rng.geometric(p_leave[can_leave])
+        end = start + hold
+
+        draws = rng.random(len(active))
+        nxt = np.minimum(
+            (draws[:, None] > leave_cdf[s]).sum(axis=1), n_states - 1
+        )
+        pos[active] = end
+        state[active] = np.where(can_leave, nxt, s)
+        active = active[end < length]
+
+    last = np.where(marked, np.arange(length), 0)
+    np.maximum.accumulate(last, axis=1, out=last)
+    states = np.take_along_axis(states, last, axis=1)
+    return states
+
+
+def regime_switching_paths(
+    n_paths,
+    length,
+    start=100.0,
+    regimes=("bull", "bear", "sideways", "volatile"),
+    params=None,
+    transition=None,
+    stay=0.98,
+    initial=None,
+    seed=None,
+):
+    """
+    Markov regime-switching log-normal prices, shape (n_paths, length).
+
+    params maps regime names to per-step (drift, volatility), defaulting
+    to REGIME_PARAMS. Without a transition matrix every regime persists
+    with probability `stay` and otherwise jumps uniformly to another.
+    initial is a regime name (random per path when None).
+    """
+    params = {**REGIME_PARAMS, **(params or {})}
+    regimes = list(regimes)
+    for name in regimes:
+        if name not in params:
+            raise ValueError(f"Unknown regime: {name}")
+    if transition is None:
+        transition = _default_transition(len(regimes), stay)
+    initial_idx = None if initial is None else regimes.index(initial)
+
+    rng = np.random.default_rng(seed)
+    states = regime_path_states(
+        n_paths, length - 1, transition, initial=initial_idx, rng=rng
+    )
+    mu = np.array([params[r][0] for r in regimes])[states]
+    sigma = np.array([params[r][1] for r in regimes])[states]
+    shocks = rng.standard_normal((n_paths, length - 1))
+    shocks *= sigma
+    shocks += mu - 0.5 * sigma * sigma
+    return _prices_from_log_returns(shocks, start)
+
+
+def jump_diffusion_paths(
+    n_paths,
+    length,
+    start=100.0,
+    mu=0.0005,
+    sigma=0.01,
+    jump_intensity=0.02,
+    jump_mean=-0.03,
+    jump_std=0.05,
+    dt=1.0,
+    seed=None,
+):
+    """
+    Merton jump-diffusion, shape (n_paths, length). Jumps arrive as a
+    Poisson process with `jump_intensity` per unit of dt and log sizes
+    N(jump_mean, jump_std); the drift is compensated so mu stays the
+    expected growth rate.
+    """
+    rng = np.random.default_rng(seed)
+    steps = (n_paths, length - 1)
+    compensator = jump_intensity * (
+        np.exp(jump_mean + 0.5 * jump_std * jump_std) - 1.0
+    )
+    log_returns = rng.standard_normal(steps)
+    log_returns *= sigma * np.sqrt(dt)
+    log_returns += (mu - 0.5 * sigma * sigma - compensator) * dt
+
+    # Sum of N iid normal jumps is N(N * mean, N * std^2).
+    n_jumps = rng.poisson(jump_intensity * dt, size=steps)
+    log_returns += n_jumps * jump_mean
+    log_returns += np.sqrt(n_jumps) * jump_std * rng.standard_normal(steps)
+    return _prices_from_log_returns(log_returns, start)
+
+
+def random_correlation(num_assets, n_factors=3, seed=None):
+    """
+    Random positive-definite correlation matrix from a few shared
+    Gaussian factors plus idiosyncratic noise.
+    """
+    rng = np.random.default_rng(seed)
+    loadings = rng.standard_normal((num_assets, n_factors))
+    cov = loadings @ loadings.T + np.diag(rng.uniform(0.5, 1.5, num_assets))
+    scale = 1.0 / np.sqrt(np.diag(cov))
+    corr = cov * scale[:, None] * scale[None, :]
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+
+def correlated_price_matrix(
+    num_assets,
+    length=None,
+    start=100.0,
+    mu=0.0005,
+    sigma=0.01,
+    corr=None,
+    schedule=None,
+    regime_length=20,
+    params=None,
+    chunk_steps=4096,
+    seed=None,
+):
+    """
+    Correlated log-normal prices, shape (num_assets, length).
+
+    mu, sigma and start are scalars or per-asset arrays; corr is a
+    (num_assets, num_assets) correlation matrix, sampled with
+    random_correlation when None. Its Cholesky factor is computed once
+    and applied to blocks of chunk_steps standard normals, so memory
+    beyond the output stays bounded.
+
+    schedule is an optional list of regime names shared by all assets,
+    each lasting regime_length steps (length defaults to the schedule
+    length). A regime adds its drift from `params` (REGIME_PARAMS by
+    default) to every asset and its volatility in quadrature.
+    """
+    rng = np.random.default_rng(seed)
+    if schedule:
+        params = {**REGIME_PARAMS, **(params or {})}
+        for name in schedule:
+            if name not in params:
+                raise ValueError(f"Unknown regime: {name}")
+        if length is None:
+            length = len(schedule) * regime_length
+    if length is None:
+        raise ValueError("Need a length or a regime schedule.")
+
+    if corr is None:
+        corr = random_correlation(num_assets, seed=rng)
+    corr = np.asarray(corr, dtype=np.float64)
+    if corr.shape != (num_assets, num_assets):
+        raise ValueError(
+            "Correlation matrix must be (num_assets, num_assets)."
+        )
+    chol = np.linalg.cholesky(corr)
+
+    mu = np.broadcast_to(np.asarray(mu, dtype=np.float64), (num_assets,))
+    sigma = np.broadcast_to(
+        np.asarray(sigma, dtype=np.float64), (num_assets,)
+    )
+    start = np.broadcast_to(
+        np.asarray(start, dtype=np.float64), (num_assets,)
+    )
+
+    steps = length - 1
+    if schedule:
+        regime_idx = np.minimum(
+            np.arange(steps) // regime_length, len(schedule) - 1
+        )
+        regime_drift = np.array([params[r][0] for r in schedule])[regime_idx]
+        regime_vol = np.array([params[r][1] for r in schedule])[regime_idx]
+
+    prices = np.empty((num_assets, length), dtype=np.float64)
+    prices[:, 0] = 0.0
+    level = np.zeros(num_assets, dtype=np.float64)
+    for t0 in range(0, steps, chunk_steps):
+        t1 = min(t0 + chunk_steps, steps)
+        # Time-major draws keep the output independent of chunk_steps.
+        shocks = chol @ rng.standard_normal((t1 - t0, num_assets)).T
+        if schedule:
+            vol = np.sqrt(sigma[:, None] ** 2 + regime_vol[None, t0:t1] ** 2)
+            drift = mu[:, None] + regime_drift[None, t0:t1]
+        else:
+            vol = sigma[:, None]
+            drift = mu[:, None]
+        shocks *= vol
+        shocks += drift - 0.5 * vol * vol
+        block = prices[:, t0 + 1:t1 + 1]
+        np.cumsum(shocks, axis=1, out=block)
+        block += level[:, None]
+        level = block[:, -1].copy()
+
+    np.exp(prices, out=prices)
+    prices *= start[:, None]
+    return prices
+
+
+# Single-path scenarios for SCENARIOS; keyword arguments override the
+# registered parameters.
+def gbm_market(length=1000, seed=0, **params):
+    return gbm_paths(1, length, seed=seed, **params)[0]
+
+
+def regime_switching_market(length=1000, seed=0, **params):
+    return regime_switching_paths(1, length, seed=seed, **params)[0]
+
+
+def jump_diffusion_market(length=1000, seed=0, **params):
+    return jump_diffusion_paths(1, length, seed=seed, **params)[0]
+
+
+STOCHASTIC_SCENARIOS = {
+    "gbm": gbm_market,
+    "regime_switching": regime_switching_market,
+    "jump_diffusion": jump_diffusion_market,
+}
+
+
+# (num_assets, T) scenarios for multi-asset runs.
+def correlated_market(num_assets=10, length=1000, seed=0, **params):
+    return correlated_price_matrix(num_assets, length, seed=seed, **params)
+
+
+def correlated_regime_shift(num_assets=10, seed=0, **params):
+    params.setdefault("schedule", ["bull", "volatile", "bear"])
+    params.setdefault("regime_length", 100)
+    return correlated_price_matrix(num_assets, seed=seed, **params)
+
+
+MULTI_ASSET_SCENARIOS = {
+    "correlated": correlated_market,
+    "correlated_regime_shift": correlated_regime_shift,
+}
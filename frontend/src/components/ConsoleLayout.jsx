@@ -324,6 +324,13 @@ export default function ConsoleLayout() {
                   <option value="regime_shift_long">
                     Regime Shift (Long)
                   </option>
+                  <option value="gbm">GBM (Stochastic)</option>
+                  <option value="regime_switching">
+                    Regime Switching (Stochastic)
+                  </option>
+                  <option value="jump_diffusion">
+                    Jump Diffusion (Stochastic)
+                  </option>
                 </select>
               </div>
               <div className="field">
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from backend.simulations import jit_kernel
+from backend.simulations.run_simulation import run_episode
+
+
+PENALTIES = dict(
+    drawdown_coeff=0.05,
+    volatility_coeff=0.03,
+    trade_penalty_coeff=0.2,
+    invalid_action_penalty=0.5,
+    inactivity_penalty=0.1,
+)
+
+
+@pytest.mark.parametrize("compiled", [True, False], ids=["jit", "python"])
+@pytest.mark.parametrize("reward_mode", ["raw", "risk_adjusted"])
+@pytest.mark.parametrize("trade_size", [1, 40])
+@pytest.mark.parametrize("agent_type", ["random", "rule_based", "buy_and_hold"])
+def test_vectorized_engine_matches_step_engine(
+    monkeypatch, agent_type, trade_size, reward_mode, compiled
+):
+    if not compiled:
+        monkeypatch.setattr(
+            jit_kernel, "_compiled_fill", jit_kernel._fill_kernel
+        )
+    rng = np.random.default_rng(7)
+    # Long enough to span several closed-form windows and cash-bound
+    # stretches.
+    prices = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, 5000)))
+    kwargs = dict(
+        agent_type=agent_type,
+        seed=11,
+        reward_mode=reward_mode,
+        trade_size=trade_size,
+        **PENALTIES,
+    )
+
+    step = run_episode(prices, engine="step", **kwargs)
+    vectorized = run_episode(prices, engine="vectorized", **kwargs)
+
+    assert vectorized["actions"] == step["actions"]
+    np.testing.assert_allclose(vectorized["trajectory"], step["trajectory"])
+    assert vectorized["metrics"].keys() == step["metrics"].keys()
+    for name, value in step["metrics"].items():
+        assert vectorized["metrics"][name] == pytest.approx(
+            value, rel=1e-9, abs=1e-9, nan_ok=True
+        ), name
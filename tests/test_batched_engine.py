@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from backend.simulations.run_simulation import run_experiment
+
+
+PENALTIES = dict(
+    drawdown_coeff=0.05,
+    volatility_coeff=0.03,
+    trade_penalty_coeff=0.2,
+    invalid_action_penalty=0.5,
+    inactivity_penalty=0.1,
+)
+
+
+@pytest.mark.parametrize("reward_mode", ["raw", "risk_adjusted"])
+@pytest.mark.parametrize("trade_size", [1, 40])
+@pytest.mark.parametrize("agent_type", ["random", "rule_based", "buy_and_hold"])
+def test_batched_engine_matches_step_engine(agent_type, trade_size, reward_mode):
+    rng = np.random.default_rng(7)
+    prices = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, 300)))
+    kwargs = dict(
+        agent_type=agent_type,
+        n_episodes=5,
+        seed_start=3,
+        reward_mode=reward_mode,
+        trade_size=trade_size,
+        rolling_window=20,
+        **PENALTIES,
+    )
+
+    step = run_experiment(prices, engine="step", **kwargs)
+    batched = run_experiment(prices, engine="batched", **kwargs)
+
+    assert batched == step
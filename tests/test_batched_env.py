@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from backend.env.batched_env import BatchedMarketEnvironment
+from backend.env.market_env import MarketEnvironment
+from experiments.stochastic_scenarios import gbm_paths
+
+
+@pytest.mark.parametrize("reward_mode", ["raw", "risk_adjusted"])
+def test_price_matrix_matches_one_env_per_row(reward_mode):
+    paths = gbm_paths(6, 200, sigma=0.02, seed=3)
+    actions = np.random.default_rng(4).integers(0, 3, (6, 199))
+    kwargs = dict(
+        reward_mode=reward_mode,
+        trade_size=30,
+        drawdown_coeff=0.05,
+        volatility_coeff=0.03,
+        trade_penalty_coeff=0.2,
+        invalid_action_penalty=0.5,
+        inactivity_penalty=0.1,
+    )
+
+    batched = BatchedMarketEnvironment(paths, len(paths), **kwargs)
+    rewards = []
+    for t in range(actions.shape[1]):
+        state, reward, _ = batched.step(actions[:, t])
+        rewards.append(reward)
+
+    for i, row in enumerate(paths):
+        env = MarketEnvironment(row, **kwargs)
+        env.reset()
+        for t in range(actions.shape[1]):
+            single, reward, _ = env.step(actions[i, t])
+            assert reward == rewards[t][i]
+        assert single["portfolio_value"] == state["portfolio_value"][i]
+        assert env.executed_trades == batched.executed_trades[i]
+
+
+def test_price_matrix_needs_one_row_per_episode():
+    with pytest.raises(ValueError, match="rows"):
+        BatchedMarketEnvironment(np.ones((3, 10)), 4)
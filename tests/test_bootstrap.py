@@ -0,0 +1,26 @@
+import numpy as np
+
+from backend.simulations.bootstrap import (
+    bootstrap_ci,
+    bootstrap_pvalue,
+    paired_bootstrap_pvalue,
+)
+
+
+def test_degenerate_samples_give_nan():
+    low, high = bootstrap_ci([1.0])
+    assert np.isnan(low).all() and np.isnan(high).all()
+
+    assert np.isnan(paired_bootstrap_pvalue([1.0], [0.0])).all()
+    assert np.isnan(paired_bootstrap_pvalue([1.0, 2.0], [0.0, 1.0])).all()
+
+    assert np.isnan(bootstrap_pvalue([1.0], [1.0, 2.0, 3.0])).all()
+    assert np.isnan(bootstrap_pvalue([1.0, 1.0], [2.0, 2.0])).all()
+
+
+def test_bootstrap_pvalue_separates_shifted_samples():
+    rng = np.random.default_rng(1)
+    same = bootstrap_pvalue(rng.normal(0, 1, 50), rng.normal(0, 1, 40))
+    shifted = bootstrap_pvalue(rng.normal(1, 1, 50), rng.normal(0, 1, 40))
+    assert same[0] > 0.05
+    assert shifted[0] < 0.01
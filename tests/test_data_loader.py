@@ -0,0 +1,102 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backend.simulations.data_loader import (
+    _date_filter,
+    load_columnar_prices,
+    load_price_series,
+)
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+ds = pytest.importorskip("pyarrow.dataset")
+
+
+DATES = ["2020-01-01", "2020-01-02", "2020-01-03"]
+INTRADAY = [
+    "2020-12-30T23:00:00",
+    "2020-12-31T00:00:00",
+    "2020-12-31T09:30:00",
+    "2020-12-31T16:00:00",
+    "2021-01-01T00:00:00",
+]
+
+
+@pytest.mark.parametrize(
+    "column",
+    [
+        pa.array(DATES),
+        pa.array([date.fromisoformat(d) for d in DATES]),
+        pa.array([date.fromisoformat(d) for d in DATES], type=pa.date64()),
+        pa.array(np.array(DATES, dtype="datetime64[s]")),
+        pa.array(np.array(DATES, dtype="datetime64[us]")).cast(
+            pa.timestamp("us", "UTC")
+        ),
+    ],
+    ids=["string", "date32", "date64", "timestamp_s", "timestamp_us_utc"],
+)
+def test_columnar_date_range_is_inclusive(tmp_path, column):
+    path = str(tmp_path / "prices.parquet")
+    pq.write_table(pa.table({"Date": column, "Close": [1.0, 2.0, 3.0]}), path)
+
+    prices, _ = load_columnar_prices(path, date_col="Date", start="2020-01-02")
+    np.testing.assert_array_equal(prices, [2.0, 3.0])
+
+    prices, _ = load_columnar_prices(
+        path, date_col="Date", start="2020-01-02", end="2020-01-02"
+    )
+    np.testing.assert_array_equal(prices, [2.0])
+
+
+def test_date_only_end_keeps_whole_day(tmp_path):
+    csv_path = tmp_path / "prices.csv"
+    csv_path.write_text(
+        "Date,Close\n"
+        + "".join(f"{d},{i}\n" for i, d in enumerate(INTRADAY))
+    )
+    parquet_path = str(tmp_path / "prices.parquet")
+    pq.write_table(
+        pa.table({
+            "Date": pa.array(np.array(INTRADAY, dtype="datetime64[ns]")),
+            "Close": np.arange(len(INTRADAY), dtype=np.float64),
+        }),
+        parquet_path,
+    )
+
+    for path in (str(csv_path), parquet_path):
+        prices, _ = load_price_series(
+            path, date_col="Date", cache=False, end="2020-12-31"
+        )
+        np.testing.assert_array_equal(prices, [0.0, 1.0, 2.0, 3.0])
+        prices, _ = load_price_series(
+            path, date_col="Date", cache=False, end="2020-12-31T09:30"
+        )
+        np.testing.assert_array_equal(prices, [0.0, 1.0, 2.0])
+
+
+@pytest.mark.parametrize("unit", ["ms", "us", "ns"])
+def test_date_filter_prunes_row_groups(tmp_path, unit):
+    path = str(tmp_path / "prices.parquet")
+    stamps = np.datetime64("2020-01-01") + np.arange(2400).astype(
+        "timedelta64[h]"
+    )
+    pq.write_table(
+        pa.table({
+            "Date": pa.array(stamps.astype(f"datetime64[{unit}]")),
+            "Close": np.arange(2400, dtype=np.float64),
+        }),
+        path,
+        row_group_size=24,
+    )
+    dataset = ds.dataset(path)
+    expr = _date_filter(
+        "Date", dataset.schema.field("Date").type, "2020-01-10", "2020-01-10"
+    )
+    groups = [
+        group
+        for fragment in dataset.get_fragments()
+        for group in fragment.split_by_row_group(expr)
+    ]
+    assert len(groups) == 1
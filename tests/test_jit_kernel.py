@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from backend.simulations.jit_kernel import COMPILED_POLICIES
+from backend.simulations.run_simulation import run_episode
+
+pytest.importorskip("numba")
+
+
+PENALTIES = dict(
+    drawdown_coeff=0.05,
+    volatility_coeff=0.03,
+    trade_penalty_coeff=0.2,
+    invalid_action_penalty=0.5,
+    inactivity_penalty=0.1,
+)
+
+
+@pytest.mark.parametrize("reward_mode", ["raw", "risk_adjusted"])
+@pytest.mark.parametrize("trade_size", [1, 40])
+@pytest.mark.parametrize("agent_type", sorted(COMPILED_POLICIES))
+def test_numba_engine_matches_step_engine(agent_type, trade_size, reward_mode):
+    rng = np.random.default_rng(7)
+    prices = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, 300)))
+    kwargs = dict(
+        agent_type=agent_type,
+        reward_mode=reward_mode,
+        trade_size=trade_size,
+        **PENALTIES,
+    )
+
+    step = run_episode(prices, engine="step", **kwargs)
+    jit = run_episode(prices, engine="numba", **kwargs)
+
+    assert jit["actions"] == step["actions"]
+    np.testing.assert_allclose(jit["trajectory"], step["trajectory"])
+    assert jit["metrics"].keys() == step["metrics"].keys()
+    for name, value in step["metrics"].items():
+        assert jit["metrics"][name] == pytest.approx(
+            value, rel=1e-9, abs=1e-9, nan_ok=True
+        ), name
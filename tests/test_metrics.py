@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from backend.simulations.metrics import max_drawdown, rolling_metrics
+
+
+@pytest.mark.parametrize("window", [2, 3, 7, 50, 120])
+def test_rolling_max_drawdown_matches_per_window(window):
+    rng = np.random.default_rng(window)
+    values = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.05, 120)))
+    values[40:45] = 0.0  # flat and zero stretches
+    values[80:90] = values[79]
+
+    rolling = rolling_metrics(values, window)["rolling_max_drawdown"]
+
+    assert np.isnan(rolling[:window - 1]).all()
+    expected = [
+        max_drawdown(values[end - window + 1:end + 1])
+        for end in range(window - 1, len(values))
+    ]
+    np.testing.assert_array_equal(rolling[window - 1:], expected)
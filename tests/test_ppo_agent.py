@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("stable_baselines3")
+
+from backend.agents.ppo_agent import train_ppo  # noqa: E402
+
+
+def test_more_envs_than_workers_is_rejected():
+    prices = np.linspace(100.0, 120.0, 60)
+    with pytest.raises(ValueError, match="n_workers"):
+        train_ppo(prices, timesteps=64, n_envs=16, n_workers=4)
+
+
+def test_workers_host_exactly_n_envs_and_restore_threads():
+    torch = pytest.importorskip("torch")
+    prices = np.linspace(100.0, 120.0, 60)
+    threads = torch.get_num_threads()
+    model = train_ppo(
+        prices, timesteps=64, n_envs=2, n_workers=4, torch_threads=1
+    )
+    assert model.n_envs == 2
+    assert torch.get_num_threads() == threads
@@ -0,0 +1,32 @@
+import gc
+
+import numpy as np
+
+from backend.simulations import result_cache
+from backend.simulations.result_cache import price_digest
+
+
+def frozen(values):
+    values = np.asarray(values, dtype=np.float64)
+    values.flags.writeable = False
+    return values
+
+
+def test_digest_memo_is_bounded_and_does_not_pin_arrays():
+    result_cache._DIGESTS.clear()
+    arrays = [
+        frozen([float(i), 1.0]) for i in range(result_cache.MAX_DIGESTS + 50)
+    ]
+    for prices in arrays:
+        price_digest(prices)
+    assert len(result_cache._DIGESTS) == result_cache.MAX_DIGESTS
+    del arrays
+
+    prices = frozen([1.0, 2.0, 3.0])
+    ref = price_digest(prices)
+    del prices
+    gc.collect()
+    # A new array that may reuse the old id still gets its own digest.
+    other = frozen([4.0, 5.0, 6.0])
+    assert price_digest(other) != ref
+    assert price_digest(other) == price_digest(np.array([4.0, 5.0, 6.0]))
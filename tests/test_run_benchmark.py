@@ -0,0 +1,54 @@
+import csv
+import sys
+
+import pytest
+
+from backend.simulations import run_benchmark
+
+
+def run(monkeypatch, out, *flags):
+    monkeypatch.setattr(sys, "argv", [
+        "run_benchmark",
+        "--scenarios", "bull,bear",
+        "--agents", "rule_based,buy_and_hold",
+        "--reward-modes", "raw",
+        "--episodes", "2",
+        "--out", str(out),
+        *flags,
+    ])
+    run_benchmark.run_benchmark()
+    with open(out, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def fingerprint(monkeypatch, *flags):
+    monkeypatch.setattr(sys, "argv", ["run_benchmark", *flags])
+    return run_benchmark.sweep_fingerprint(run_benchmark.parse_args())
+
+
+def test_resume_skips_completed_tasks(monkeypatch, tmp_path, capsys):
+    out = tmp_path / "results.csv"
+    full = run(monkeypatch, out)
+    manifest = tmp_path / "results.csv.manifest"
+    # Keep the fingerprint and the first completed task, as after a crash.
+    lines = manifest.read_text().splitlines(keepends=True)
+    manifest.write_text("".join(lines[:2]))
+    capsys.readouterr()
+
+    resumed = run(monkeypatch, out)
+    assert "Resuming: 1 tasks already complete." in capsys.readouterr().out
+    key = lambda r: (r["scenario"], r["agent"], r["run_id"])
+    assert sorted(resumed, key=key) == sorted(full, key=key)
+
+    run(monkeypatch, out, "--trade-size", "2")
+    assert "Resuming" not in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "flag, same",
+    [("--workers", True), ("--n-jobs", True), ("--n-workers", False)],
+)
+def test_fingerprint_ignores_only_execution_flags(monkeypatch, flag, same):
+    base = fingerprint(monkeypatch)
+    changed = fingerprint(monkeypatch, flag, "4")
+    assert (changed == base) == same
@@ -0,0 +1,12 @@
+import json
+
+from backend.simulations.run_simulation import run_configured_experiment
+from experiments.experiment_config import ExperimentConfig
+
+
+def test_single_episode_summary_is_strict_json():
+    result = run_configured_experiment(
+        ExperimentConfig("bull", "rule_based", episodes=1)
+    )
+    json.dumps(result, allow_nan=False)
+    assert result["summary"]["final_value_ci_low"] is None
@@ -0,0 +1,34 @@
+import numpy as np
+
+from experiments import scenario_registry
+from experiments.scenario_registry import (
+    attach,
+    cached_series,
+    shared_prices,
+)
+
+
+def test_cache_is_bounded_and_releases_evicted_blocks(monkeypatch):
+    monkeypatch.setattr(scenario_registry, "MAX_CACHED", 2)
+    scenario_registry.clear_cache()
+    first = cached_series("first", lambda: np.arange(5.0))
+    with shared_prices(first):
+        pass
+    assert id(first) in scenario_registry._PUBLISHED
+
+    cached_series("second", lambda: np.arange(6.0))
+    cached_series("third", lambda: np.arange(7.0))
+    assert list(scenario_registry._CACHE) == ["second", "third"]
+    assert id(first) not in scenario_registry._PUBLISHED
+    scenario_registry.clear_cache()
+
+
+def test_attach_drops_blocks_no_longer_in_use():
+    for i in range(5):
+        with shared_prices(np.arange(100.0) + i) as handle:
+            view = attach(handle)
+            assert view[0] == i
+            del view
+    with shared_prices(np.arange(3.0)) as handle:
+        attach(handle)
+        assert list(scenario_registry._ATTACHED) == [handle.name]